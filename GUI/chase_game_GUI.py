@@ -3,12 +3,18 @@
 # Author     :Li Yijia
 """
 
+import os
+import sys
+import tempfile
 from tkinter import *
 from tkinter import messagebox
 
 from ttkbootstrap import Style
-from common import return_df_pretty
+import shared_modules  # noqa: F401, before the modules of the parent folder
 from chase_generator_distinguished_version import DistinguishedVariableChaseChecker
+from tableau_grid import TableauGrid
+from chase_runner import ChaseRunner, DONE, CANCELLED
+from chase_trace import TraceReader, TraceWriter
 
 
 class Model:
@@ -37,6 +43,7 @@ class View:
         self.lb2 = None
         self.lb3 = None
         self.third_frame = None
+        self.grid = None
         self.root = root
         self.model = model
         self.save_data = save_data
@@ -151,54 +158,233 @@ class View:
         third_label.pack()
         third_button.pack()
 
-        self.third_txt = Text(self.third_frame, width=100, height=30, font=('Arial', 10))
+        # the tableau is filled once, then each step only patches its changed cells
+        self.grid = TableauGrid(self.third_frame, self.model.attributes)
+        self.grid.load(self.model.checker.get_rows())
+        self.third_txt = Text(self.third_frame, width=100, height=15, font=('Arial', 10))
 
         a = "Attributes list: {}".format(', '.join(self.model.attributes))
         self.third_txt.insert(END, a + '\n')
-        b = "Initial Tuples:"
+        b = "Initial Tuples are shown in the table."
         self.third_txt.insert(END, b + '\n')
-        c = return_df_pretty(self.model.checker.table)
-        self.third_txt.insert(END, c)
+        self.grid.pack()
+        self.third_txt.pack()
+        self.third_frame.pack()
+
+    def show_trace(self, trace):
+        """
+        Browse a recorded trace, without entering the inputs
+        """
+        self.main_frame.pack_forget()
+        self.third_frame = Frame(self.root)
+        Label(self.third_frame, text="Browsing a recorded trace", font=self.my_biggest_font).pack()
+        self.grid = TableauGrid(self.third_frame, trace.columns, index_header=trace.index_header)
+        self.third_txt = Text(self.third_frame, width=100, height=15, font=('Arial', 10))
+        self.grid.pack()
         self.third_txt.pack()
         self.third_frame.pack()
 
 
 class Controller:
-    def __init__(self, root, model):
+    def __init__(self, root, model, trace_path: str = None):
+        self.root = root
         self.model = model
         self.view = View(root, model, self.save_data, self.handle_start_process_click)
         self.generator = None
+        self.runner = None
+        self.steps_per_sec = None
+        self.step_number = None
         self.running = True
         self.start_process = None
+        # recorded trace, browsed forward and backward once the live chase stops
+        self.trace = None
+        self.trace_path = None
+        self.trace_step = 0
+        self.playing = None
+        # the live chase records its trace here, removed when the window closes
+        self.trace_dir = tempfile.TemporaryDirectory(prefix="chase-", ignore_cleanup_errors=True)
+        root.protocol("WM_DELETE_WINDOW", self.close)
+        if trace_path:
+            self.running = False
+            self.trace = TraceReader(trace_path)
+            self.view.show_trace(self.trace)
+            self.add_buttons()
+            self.go_to(0)
+
+    def add_buttons(self):
+        buttons = Frame(self.view.third_frame)
+        Button(buttons, text='Back', command=self.back,font=("Arial", 16)).pack(side=LEFT)
+        Button(buttons, text='Next Step', command=self.next_step,font=("Arial", 16)).pack(side=LEFT)
+        Button(buttons, text='Run to end', command=self.run_to_end,font=("Arial", 16)).pack(side=LEFT)
+        self.steps_per_sec = Spinbox(buttons, from_=1, to=100, width=4)
+        self.steps_per_sec.pack(side=LEFT)
+        Button(buttons, text='Play steps/sec', command=self.play,font=("Arial", 16)).pack(side=LEFT)
+        Button(buttons, text='Pause', command=self.pause,font=("Arial", 16)).pack(side=LEFT)
+        Button(buttons, text='Cancel', command=self.cancel,font=("Arial", 16)).pack(side=LEFT)
+        self.step_number = Spinbox(buttons, from_=0, to=1000000, width=8)
+        self.step_number.pack(side=LEFT)
+        Button(buttons, text='Go to step', command=self.go_to_step,font=("Arial", 16)).pack(side=LEFT)
+        buttons.pack()
 
     def handle_start_process_click(self):
         if self.start_process:
             messagebox.showinfo("Info", "Already started!")
             return
-        next_step_button = Button(self.view.third_frame, text='Next Step', command=self.next_step,font=("Arial", 16))
-        next_step_button.pack()
+        # the chase runs on a worker thread, the buttons only send requests to it
+        self.add_buttons()
         self.start_process = True
         checker = self.model.checker
         self.generator = checker.chase_generator()
+        # every step is recorded, so it can be browsed back when the chase stops
+        self.trace_path = os.path.join(self.trace_dir.name, "chase.trace")
+        trace = TraceWriter(self.trace_path, self.model.attributes, checker.get_rows(), self.view.grid.index_header)
+        self.runner = ChaseRunner(self.generator, self.root, self.show_frame, self.finish, trace=trace)
+        self.runner.start()
         self.running = True
 
     def next_step(self):
-        if self.running:
-            try:
-                next_value = next(self.generator)
-                if type(next_value) == tuple:
-                    self.view.third_txt.insert(END, next_value[0] + '\n')
-                    self.view.third_txt.insert(END, next_value[1] + '\n')
-                    self.view.third_txt.see(END)
-                else:
-                    self.view.third_txt.insert(END, next_value + '\n')
-                    self.view.third_txt.see(END)
-            except StopIteration:
-                self.running = False
+        if self.trace is not None:
+            if self.trace_step < len(self.trace):
+                self.forward()
+            else:
                 messagebox.showinfo("Info", "process completed!")
-                # Button(self.view.third_frame, text="OK", command=self.handle_return_click, width=6, height=2).pack()
+        elif self.running:
+            self.runner.step()
         elif self.running is False:
             messagebox.showinfo("Info", "process completed!")
+
+    def back(self):
+        if self.trace is None:
+            messagebox.showinfo("Info", "Steps can be browsed back when the chase is completed or cancelled!")
+        elif self.trace_step > 0:
+            self.backward()
+
+    def run_to_end(self):
+        if self.trace is not None:
+            self.go_to(len(self.trace))
+        elif self.running:
+            self.runner.run_to_end()
+
+    def read_steps_per_sec(self):
+        try:
+            steps_per_sec = float(self.steps_per_sec.get())
+        except ValueError:
+            messagebox.showinfo("Info", "steps/sec should be a number!")
+            return None
+        if steps_per_sec <= 0:
+            messagebox.showinfo("Info", "steps/sec should be positive!")
+            return None
+        return steps_per_sec
+
+    def play(self):
+        if self.trace is None and not self.running:
+            return
+        steps_per_sec = self.read_steps_per_sec()
+        if steps_per_sec is None:
+            return
+        if self.trace is None:
+            self.runner.play(steps_per_sec)
+            return
+        self.pause()
+
+        def tick():
+            if self.trace_step < len(self.trace):
+                self.forward()
+                self.playing = self.root.after(int(1000 / steps_per_sec), tick)
+            else:
+                self.playing = None
+
+        tick()
+
+    def pause(self):
+        if self.trace is not None:
+            if self.playing is not None:
+                self.root.after_cancel(self.playing)
+                self.playing = None
+        elif self.running:
+            self.runner.pause()
+
+    def cancel(self):
+        if self.trace is not None:
+            self.pause()
+        elif self.running:
+            self.runner.cancel()
+
+    def go_to_step(self):
+        if self.trace is None:
+            messagebox.showinfo("Info", "Steps can be browsed when the chase is completed or cancelled!")
+            return
+        try:
+            step = int(self.step_number.get())
+        except ValueError:
+            messagebox.showinfo("Info", "step should be an integer!")
+            return
+        if not 0 <= step <= len(self.trace):
+            messagebox.showinfo("Info", f"step should be between 0 and {len(self.trace)}!")
+            return
+        self.go_to(step)
+
+    def trace_header(self) -> str:
+        return "Attributes list: {}\nInitial Tuples are shown in the table.\n".format(', '.join(self.trace.columns))
+
+    def forward(self):
+        self.trace_step += 1
+        self.view.third_txt.insert(END, self.trace.message(self.trace_step) + '\n')
+        self.view.third_txt.see(END)
+        if self.trace.changes_table(self.trace_step):
+            self.view.grid.apply_delta(self.trace.delta(self.trace_step, len(self.view.grid.data)))
+
+    def backward(self):
+        # drop the message of the current step, the text ends with it
+        message = self.trace.message(self.trace_step)
+        self.view.third_txt.delete(f"end-{len(message) + 2}c", "end-1c")
+        self.trace_step -= 1
+        self.view.grid.load(self.trace.rows(self.trace_step))
+
+    def go_to(self, step: int):
+        """
+        Show the tableau after step, loaded from the nearest snapshot of the trace
+        """
+        self.trace_step = step
+        self.view.third_txt.delete("1.0", END)
+        self.view.third_txt.insert(END, self.trace_header() +
+                                "".join(self.trace.message(i) + '\n' for i in range(1, step + 1)))
+        self.view.third_txt.see(END)
+        self.view.grid.load(self.trace.rows(step))
+
+    def show_frame(self, text, delta):
+        """
+        Steps drained in one poll, text of all steps and their merged TableDelta
+        """
+        self.view.third_txt.insert(END, text)
+        self.view.third_txt.see(END)
+        if delta:
+            self.view.grid.apply_delta(delta)
+
+    def close(self):
+        """
+        Stop the chase and remove its recorded trace with the window
+        """
+        if self.runner is not None:
+            self.runner.cancel()
+        if self.trace is not None:
+            self.trace.close()
+        self.trace_dir.cleanup()
+        self.root.destroy()
+
+    def finish(self, status, error):
+        self.running = False
+        if status == DONE:
+            messagebox.showinfo("Info", "process completed!")
+        elif status == CANCELLED:
+            messagebox.showinfo("Info", "process cancelled!")
+        else:
+            messagebox.showerror("Error", f"process failed: {error}")
+            return
+        # browse the recorded steps from here, the row labels of the trace replace the live ones
+        self.trace = TraceReader(self.trace_path)
+        self.trace_step = len(self.trace)
+        self.view.grid.load(self.trace.rows(self.trace_step))
     # def handle_return_click(self):
     #     self.view.third_frame.pack_forget()
     #     self.model = Model()
@@ -231,5 +417,6 @@ if __name__ == "__main__":
     root.geometry('1280x650')
     root.title('The Chase Algorithm')
     model = Model()
-    app = Controller(root, model)
+    # python chase_game_GUI.py run.trace browses a trace recorded by record_trace
+    app = Controller(root, model, sys.argv[1] if len(sys.argv) > 1 else None)
     root.mainloop()
@@ -7,11 +7,21 @@ Copyright 2024 Xie Yuan
 
 import pandas as pd
 import re
-from common import return_df_pretty
+import shared_modules  # noqa: F401, before the modules of the parent folder
+from chase_stats import ChaseStats
+from tableau_grid import TableDelta
+from chase_trace import record_trace
+from chase_worklist import ChaseWorklist
+from tableau_index import TableauIndex
 
 
 class DistinguishedVariableChaseChecker:
-    def __init__(self, input_option, input_attributes, input_dependencies, input_desired_decompositions_dependency):
+    def __init__(self, input_option, input_attributes, input_dependencies, input_desired_decompositions_dependency,
+                 stats: ChaseStats = None):
+        """
+        :param stats: collector recording every tried dependency, None to skip the instrumentation
+        """
+        self.stats = stats
         self.option = input_option
         self.attributes = input_attributes
 
@@ -36,6 +46,10 @@ class DistinguishedVariableChaseChecker:
             self.desired_xs = self.desired_x.split(",")
             self.desired_ys = self.desired_y.split(",")
         self.table = self.generate_initial_state()
+        # lhs index of the tableau, built on first probe
+        self.table_index = None
+        # cells changed and rows appended by the last step
+        self.delta = TableDelta()
 
     def generate_initial_state(self) -> pd.DataFrame:
         """
@@ -52,38 +66,58 @@ class DistinguishedVariableChaseChecker:
         # print_df_pretty(table)
         return table
 
+    def get_rows(self) -> list[tuple]:
+        """
+        (row index, values) of each row, to fill a TableauGrid once
+        """
+        return list(enumerate(self.table.itertuples(index=False, name=None)))
+
+    def record_trace(self, path: str, snapshot_every: int = 64) -> int:
+        """
+        Run the chase to the end and record it as a binary trace, to browse it later
+        :return: number of steps
+        """
+        return record_trace(self.chase_generator(), path, self.attributes, self.get_rows(), "",
+                            snapshot_every)
+
+    def distinguish(self, row: int, columns, delta: TableDelta) -> None:
+        self.table.loc[row, columns] = 'α'
+        for column in columns:
+            delta.change_cell(row, column, 'α')
+
     def change_initial_tuple(self):
         """
         Preprocess state table according to 3 cases
-        :return:
+        :return: message, distinguished cells as a TableDelta
         """
         str = ''
+        delta = TableDelta()
         if self.option == 1:
             # for each decomposition, e.g. 1st A,B,D, make 1st row all columns alpha
             aa = f"\nFor columns in each decomposition, distinguish their values in corresponding tuple."
             for i, decomposition in enumerate(self.desired_decompositions):
-                self.table.loc[i, decomposition] = 'α'
+                self.distinguish(i, decomposition, delta)
             str = aa
         else:
             if self.is_desired_dependency_mvd:
                 # For each A ∈ X ∪ Y , distinguish A−values in the first tuple.
                 union = list(set(self.desired_xs).union(self.desired_ys))
                 bb = f"\nFor columns in {union}, distinguish their values in the first tuple."
-                self.table.loc[0, union] = 'α'
+                self.distinguish(0, union, delta)
                 # For each A ∈ X ∪ (R − X − Y ), Distinguish A−values in the second tuple.
                 other_columns = list(set(self.desired_xs).union(set(self.attributes).difference(set(self.desired_xs)).difference(set(self.desired_ys))))
                 cc = f"For columns in {other_columns}, distinguish their values in the second tuple."
-                self.table.loc[1, other_columns] = 'α'
+                self.distinguish(1, other_columns, delta)
                 str = bb + '\n' + cc
             else:
                 # Distinguish the values of the first tuple.
                 dd = "\nDistinguish the values of the first tuple."
-                self.table.loc[0] = 'α'
+                self.distinguish(0, self.attributes, delta)
                 # For each A ∈ X, distinguish the A−values in the second tuple.
                 ee = f"For columns in {self.desired_xs}, distinguish their values in the second tuple."
-                self.table.loc[1, self.desired_xs] = 'α'
+                self.distinguish(1, self.desired_xs, delta)
                 str = dd + '\n' + ee
-        return ('\n' + str + '\n',return_df_pretty(self.table))
+        return '\n' + str + '\n', delta
 
     def chase_generator(self) -> None:
         """
@@ -94,17 +128,18 @@ class DistinguishedVariableChaseChecker:
         yield result
         success = False
         # Start iterations
-        # note: we should consider the sequence of dependencies
-        while self.dependencies:
-            d = self.dependencies.pop(0)
+        # a dependency is tried again only when a column it reads changed, the chase stops when the worklist is empty
+        worklist = ChaseWorklist(self.dependencies)
+        while worklist:
+            d = worklist.pop()
             aa = f"\nTry to apply the dependency: {d}"
             yield aa
             # print(f"\nTry to apply the dependency: {d}")
-            result = self.apply_dependency(d)
+            changed_columns = self.try_dependency(d)
             # if cannot apply this dependency
-            if not result:
+            if not changed_columns:
                 # it is the last dependency, we fail
-                if not self.dependencies:
+                if not worklist:
                     bb = "Cannot apply this dependency. And it is the last dependency, dependency is violated"
                     yield bb
                     # print("Cannot apply this dependency. And it is the last dependency, dependency is violated")
@@ -113,15 +148,14 @@ class DistinguishedVariableChaseChecker:
                     cc = "Cannot apply this dependency. It is not the last dependency, apply the next dependency first"
                     yield cc
                     # print("Cannot apply this dependency. It is not the last dependency, apply the next dependency first")
-                    # append it to the end for later use
-                    self.dependencies.append(d)
-                    continue
+                # tried again once a column it reads changes
+                continue
+            worklist.notify_changed(changed_columns)
             # successfully applied this dependency
             dd = "Tuples after Applying Dependency:"
-            yield dd
             # print("Tuples after Applying Dependency:")
-            tt = return_df_pretty(self.table)
-            yield tt
+            # only the cells changed by this step, the view patches its grid
+            yield dd, self.delta
 
             if self.option == 1:
                 ee = f"\nChecking if one tuple has all same value α..."
@@ -160,7 +194,7 @@ class DistinguishedVariableChaseChecker:
                 break
 
             # if still have dependencies
-            if self.dependencies:
+            if worklist:
                 if self.option == 1:
                     jj = f"Cannot find a row of distinguished variables, continue applying other dependencies"
                     yield jj
@@ -194,57 +228,96 @@ class DistinguishedVariableChaseChecker:
                 yield pp
                 # print(f"\nSorry! Invalid desired dependency {self.desired_dependency}.")
 
-    def apply_dependency(self, d: str) -> bool:
+    def apply_dependency(self, d: str) -> list[str]:
         """
         Process each d as in current iteration.
         if d is functional dependency, find tuples with same x, make y the same
         if d is multi-value dependency, copy the two rows pairs with same x, swap their y values
         :param d: each dependency
-        :return: if successful
+        :return: changed columns, empty if the table is not changed
         """
         # multi-value dependency
         if "->>" in d:
             x, y = d.split("->>")
             xs, ys = x.split(","), y.split(",")
-            # find rows with same xs
-            duplicated_rows = self.table[self.table.duplicated(subset=xs, keep=False)]
-            if not len(duplicated_rows):
-                return False
-            # group by xs, each group may have more than two rows, swap each pair two rows' ys
-            groups = duplicated_rows.groupby(xs)
-            for _, group_df in groups:
-                group_df.reset_index(drop=True, inplace=True)
-
-                for i in range(len(group_df)):
-                    for j in range(i + 1, len(group_df)):
-                        pair = group_df.iloc[[i, j]]
-                        pair.reset_index(drop=True, inplace=True)
+            # find rows with same xs from the index
+            table_index = self.get_table_index()
+            groups = table_index.matching_groups(xs)
+            self.count(rows_scanned=sum(len(rows) for rows in groups))
+            if not groups:
+                return []
+            new_rows = []
+            # each group may have more than two rows, swap each pair two rows' ys
+            for rows in groups:
+                for i in range(len(rows)):
+                    for j in range(i + 1, len(rows)):
+                        row1, row2 = table_index.rows[rows[i]].copy(), table_index.rows[rows[j]].copy()
                         # swap their ys values
-                        pair.loc[0, ys], pair.loc[1, ys] = pair.loc[1, ys], pair.loc[0, ys]
-                        self.table = pd.concat([self.table, pair], ignore_index=True)
+                        for col in ys:
+                            position = table_index.column_position[col]
+                            row1[position], row2[position] = row2[position], row1[position]
+                        new_rows += [row1, row2]
+            # no new tuple, appending the copies would only grow the tableau each time the mvd is tried again
+            if not any(not table_index.contains(row) for row in new_rows):
+                return []
+            for row in new_rows:
+                row_id = table_index.append_row(row)
+                self.delta.append_row(row_id, row)
+            self.count(rows_appended=len(new_rows))
+            self.table = pd.concat([self.table, pd.DataFrame(new_rows, columns=self.attributes)], ignore_index=True)
+            # new rows may match any dependency
+            return list(self.attributes)
         # functional dependency
         else:
             x, y = d.split("->")
             xs, ys = x.split(","), y.split(",")
-            # find rows with same xs
-            duplicated_rows = self.table[self.table.duplicated(subset=xs, keep=False)]
-            if not len(duplicated_rows):
-                return False
-            # group by xs,
+            # find rows with same xs from the index
+            table_index = self.get_table_index()
+            groups = table_index.matching_groups(xs)
+            self.count(rows_scanned=sum(len(rows) for rows in groups))
+            if not groups:
+                return []
+            changed_columns = []
             # if one row's ys is alpha, make other ys alpha
             # else if one row has small subscript
-            groups = duplicated_rows.groupby(xs)
-            for _, group_df in groups:
+            for rows in groups:
                 for col in ys:
-                    alpha_exists = 'α' in group_df[col].values
-                    # Update the col column with 'α'
-                    if alpha_exists:
-                        self.table.loc[group_df.index, col] = 'α'
-                    else:
-                        min_subscript_value = group_df[col].min().item()
-                        # Update the col column with the smallest value
-                        self.table.loc[group_df.index, col] = min_subscript_value
-        return True
+                    values = [table_index.value(row, col) for row in rows]
+                    value = 'α' if 'α' in values else min(values)
+                    # only cells with a different value are updated
+                    changed_rows = table_index.set_value(rows, col, value)
+                    if changed_rows:
+                        self.count(cells_equated=len(changed_rows))
+                        for row in changed_rows:
+                            self.delta.change_cell(row, col, value)
+                        self.table.loc[changed_rows, col] = value
+                        if col not in changed_columns:
+                            changed_columns.append(col)
+            return changed_columns
+
+    def count(self, **counters) -> None:
+        if self.stats is not None:
+            self.stats.count(**counters)
+
+    def try_dependency(self, d: str) -> list[str]:
+        """
+        apply_dependency, recorded as one step if instrumented
+        """
+        self.delta = TableDelta(d)
+        if self.stats is None:
+            return self.apply_dependency(d)
+        self.stats.begin_step(d)
+        changed_columns = self.apply_dependency(d)
+        self.stats.end_step(bool(changed_columns), len(self.table))
+        return changed_columns
+
+    def get_table_index(self) -> TableauIndex:
+        """
+        Hash index on lhs projections of the tableau, kept in sync by apply_dependency
+        """
+        if self.table_index is None:
+            self.table_index = TableauIndex(self.table)
+        return self.table_index
 
     def if_found_one_tuple_with_same_value(self):
         return self.table.apply(lambda row: all(value == 'α' for value in row), axis=1).any()
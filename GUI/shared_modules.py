@@ -0,0 +1,11 @@
+"""
+Put the parent folder on sys.path, so the GUI scripts import the tableau and chase modules the command line
+checkers use instead of keeping copies of them. Import it before those modules.
+"""
+
+import os
+import sys
+
+PARENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PARENT_DIR not in sys.path:
+    sys.path.append(PARENT_DIR)
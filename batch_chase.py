@@ -0,0 +1,230 @@
+"""
+Batch solver for chase problems in a JSONL file, one problem per line, solved on a process pool.
+Results are streamed back as JSONL in input order.
+
+Problem lines:
+{"id": 1, "type": "lossless", "attributes": 4, "dependencies": ["A->>B", "B->>C"], "decompositions": [["A", "B"], ["B", "C"], ["A", "D"]]}
+{"id": 2, "type": "dependency", "attributes": ["A", "B", "C", "D"], "dependencies": ["A->>B,C", "D->C"], "desired": "A->C"}
+{"id": 3, "type": "min_cover", "fds": [[["A", "B"], ["C"]], [["C"], ["A"]]]}
+
+"attributes" is either the number of attributes (from 'A') or the attribute list.
+Chase problems may set "checker": "simple" | "distinguished", "engine": "pandas" | "numpy" and "restricted": true.
+Dependency problems may set "checker": "basis" to decide the desired dependency by the dependency basis without
+any tableau, the result then only has "success".
+Chase problems may set "checkpoint": path, saved every "checkpoint_steps" steps or "checkpoint_seconds" seconds,
+so a pre-empted batch resumes each problem from its latest checkpoint.
+
+Usage:
+python batch_chase.py problems.jsonl -o results.jsonl --workers 8 --chunk-size 32
+python batch_chase.py problems.jsonl -o results.jsonl --checkpoint-dir checkpoints --checkpoint-seconds 300
+python batch_chase.py problems.jsonl -o results.jsonl --verdict-only
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from chase_checkpoint import ChaseCheckpointer
+from chase_with_distinguished_variables import DistinguishedVariableChaseChecker
+from dependency_basis import DependencyBasisChecker
+from generate_minimal_cover_jacob import get_all_attributes, min_cover
+from simple_chase import SimpleChaseChecker
+
+
+def parse_attributes(attributes) -> list:
+    """
+    4 -> ['A', 'B', 'C', 'D'], a list is kept as it is
+    """
+    if isinstance(attributes, int):
+        return [chr(ord('A') + i) for i in range(attributes)]
+    return list(attributes)
+
+
+def get_checkpointer(problem: dict) -> ChaseCheckpointer | None:
+    """
+    Checkpointer of a chase problem with "checkpoint" set, saved every 60 seconds if no interval is given
+    """
+    if not problem.get("checkpoint"):
+        return None
+    every_steps = problem.get("checkpoint_steps")
+    every_seconds = problem.get("checkpoint_seconds")
+    if every_steps is None and every_seconds is None:
+        every_seconds = 60
+    return ChaseCheckpointer(problem["checkpoint"], every_steps, every_seconds)
+
+
+def solve_problem(problem: dict) -> dict:
+    """
+    Solve one problem without printing
+    :return: result dict with the problem id, or the error message if the problem cannot be solved
+    """
+    result = {"id": problem.get("id")}
+    try:
+        problem_type = problem["type"]
+        if problem_type not in ["lossless", "dependency", "min_cover"]:
+            raise ValueError(f"Unknown problem type '{problem_type}'")
+        if problem_type == "min_cover":
+            fds = problem["fds"]
+            all_attributes = parse_attributes(problem["attributes"]) if "attributes" in problem \
+                else get_all_attributes(fds)
+            result["min_cover"] = min_cover(all_attributes, fds, verbose=False)
+            return result
+
+        attributes = parse_attributes(problem["attributes"])
+        if problem_type == "dependency" and problem.get("checker") == "basis":
+            checker = DependencyBasisChecker(attributes, problem["dependencies"])
+            result["success"] = checker.implies(problem["desired"])
+            return result
+        checkpoint = get_checkpointer(problem)
+        if problem_type == "lossless":
+            checker = DistinguishedVariableChaseChecker(engine=problem.get("engine", "pandas"),
+                                                        restricted=problem.get("restricted", False), option=1,
+                                                        attributes=attributes,
+                                                        dependencies=problem["dependencies"],
+                                                        desired=problem["decompositions"], verbose=False,
+                                                        checkpoint=checkpoint)
+            chase_result = checker.run_chase_algorithm()
+        else:
+            if problem.get("checker", "distinguished") == "simple":
+                checker = SimpleChaseChecker(restricted=problem.get("restricted", False), attributes=attributes,
+                                             dependencies=problem["dependencies"],
+                                             desired_dependency=problem["desired"], verbose=False,
+                                             checkpoint=checkpoint)
+                chase_result = checker.run_simple_chase_algorithm()
+            else:
+                checker = DistinguishedVariableChaseChecker(engine=problem.get("engine", "pandas"),
+                                                            restricted=problem.get("restricted", False), option=0,
+                                                            attributes=attributes,
+                                                            dependencies=problem["dependencies"],
+                                                            desired=problem["desired"], verbose=False,
+                                                            checkpoint=checkpoint)
+                chase_result = checker.run_chase_algorithm()
+        result["success"] = chase_result.success
+        result["steps"] = chase_result.steps
+        result["rows"] = len(chase_result.table)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def solve_chunk(problems: list[dict]) -> list[dict]:
+    return [solve_problem(problem) for problem in problems]
+
+
+def read_problems(lines):
+    """
+    Parse JSONL lines lazily, blank lines are skipped
+    """
+    for line in lines:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def get_checkpoint_name(problem_id) -> str:
+    """
+    File name for a problem id, only letters, digits, '_' and '-' are kept so the file stays in the checkpoint
+    directory, e.g. '../x' -> '___x-<hash>'. The hash of the id keeps two ids differing in replaced characters apart
+    """
+    problem_id = str(problem_id)
+    name = re.sub(r"[^A-Za-z0-9_-]", "_", problem_id)
+    if name != problem_id or not name:
+        name += "-" + hashlib.sha256(problem_id.encode()).hexdigest()[:12]
+    return name
+
+
+def add_checkpoints(problems, checkpoint_dir: str, every_steps: int = None, every_seconds: float = None):
+    """
+    Give each chase problem without its own checkpoint the file checkpoint_dir/<id or line number>.ckpt,
+    the id is made a safe file name by get_checkpoint_name
+    """
+    for i, problem in enumerate(problems):
+        if problem.get("type") != "min_cover" and not problem.get("checkpoint"):
+            name = get_checkpoint_name(problem.get("id", f"line{i + 1}"))
+            problem["checkpoint"] = os.path.join(checkpoint_dir, f"{name}.ckpt")
+            if every_steps is not None:
+                problem.setdefault("checkpoint_steps", every_steps)
+            if every_seconds is not None:
+                problem.setdefault("checkpoint_seconds", every_seconds)
+        yield problem
+
+
+def use_basis_checker(problems):
+    """
+    Decide dependency problems without their own checker by the dependency basis
+    """
+    for problem in problems:
+        if problem.get("type") == "dependency":
+            problem.setdefault("checker", "basis")
+        yield problem
+
+
+def solve_batch(problems, workers: int = None, chunk_size: int = 16, max_pending_chunks: int = None):
+    """
+    Solve problems on a process pool and yield results in input order.
+    At most max_pending_chunks chunks are in flight, so a large file is never loaded at once.
+    :param problems: iterable of problem dicts
+    :param workers: number of processes, default is the number of CPUs
+    :param chunk_size: number of problems sent to a worker at once
+    :param max_pending_chunks: default is twice the number of workers
+    """
+    problems = iter(problems)
+    workers = workers or os.cpu_count() or 1
+    if max_pending_chunks is None:
+        max_pending_chunks = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        while True:
+            # keep the pool busy
+            while len(pending) < max_pending_chunks:
+                chunk = list(islice(problems, chunk_size))
+                if not chunk:
+                    break
+                pending.append(executor.submit(solve_chunk, chunk))
+            if not pending:
+                break
+            # the oldest chunk comes first, so results stay in input order
+            yield from pending.popleft().result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve chase problems from a JSONL file on a process pool")
+    parser.add_argument("input", help="JSONL file of problems, '-' for stdin")
+    parser.add_argument("-o", "--output", help="JSONL file of results, default stdout")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=16, help="problems sent to a worker at once")
+    parser.add_argument("--checkpoint-dir", help="checkpoint every chase problem in this directory, "
+                                                 "a restarted batch resumes from the checkpoints")
+    parser.add_argument("--checkpoint-steps", type=int, default=None, help="applied dependencies between checkpoints")
+    parser.add_argument("--checkpoint-seconds", type=float, default=None,
+                        help="seconds between checkpoints, default 60 if --checkpoint-steps is not set")
+    parser.add_argument("--verdict-only", action="store_true",
+                        help="decide dependency problems by the dependency basis, without steps and rows")
+    args = parser.parse_args()
+
+    input_file = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output_file = sys.stdout if args.output is None else open(args.output, "w", encoding="utf-8")
+    problems = read_problems(input_file)
+    if args.verdict_only:
+        problems = use_basis_checker(problems)
+    if args.checkpoint_dir:
+        os.makedirs(args.checkpoint_dir, exist_ok=True)
+        problems = add_checkpoints(problems, args.checkpoint_dir, args.checkpoint_steps, args.checkpoint_seconds)
+    try:
+        for result in solve_batch(problems, args.workers, args.chunk_size):
+            output_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""
+Benchmarks for the chase engines, run with
+python -m benchmarks.run_benchmarks
+"""
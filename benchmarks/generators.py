@@ -0,0 +1,73 @@
+"""
+Seeded generators of random chase workloads.
+Attributes are single letters from 'A', as the checkers parse them, so at most 26 attributes.
+"""
+
+import random
+
+MAX_ATTRIBUTES = 26
+
+
+def generate_attributes(num_attributes: int) -> list:
+    assert 0 < num_attributes <= MAX_ATTRIBUTES, f"at most {MAX_ATTRIBUTES} attributes"
+    return [chr(ord('A') + i) for i in range(num_attributes)]
+
+
+def generate_dependencies(num_attributes: int, num_dependencies: int, lhs_width: int = 1, rhs_width: int = 1,
+                          mvd_ratio: float = 0.0, seed: int = 0) -> list[str]:
+    """
+    Random dependency strings like 'A,C->>B' or 'D->E'
+    :param lhs_width: number of attributes on the left-hand side
+    :param rhs_width: number of attributes on the right-hand side, disjoint from the lhs
+    :param mvd_ratio: fraction of dependencies that are multi-value
+    """
+    rng = random.Random(seed)
+    attributes = generate_attributes(num_attributes)
+    assert lhs_width + rhs_width <= num_attributes
+    dependencies = []
+    for _ in range(num_dependencies):
+        sides = rng.sample(attributes, lhs_width + rhs_width)
+        lhs, rhs = sorted(sides[:lhs_width]), sorted(sides[lhs_width:])
+        arrow = "->>" if rng.random() < mvd_ratio else "->"
+        dependencies.append(f"{','.join(lhs)}{arrow}{','.join(rhs)}")
+    return dependencies
+
+
+def generate_desired_dependency(num_attributes: int, lhs_width: int = 1, is_mvd: bool = False, seed: int = 0) -> str:
+    return generate_dependencies(num_attributes, 1, lhs_width, 1, 1.0 if is_mvd else 0.0, seed)[0]
+
+
+def generate_decompositions(num_attributes: int, num_relations: int, relation_width: int, seed: int = 0) -> list[list]:
+    """
+    Random connected decompositions covering every attribute, e.g. [['A', 'B'], ['B', 'C', 'D']]
+    Each relation shares at least one attribute with an earlier one, otherwise no fd applies across relations
+    and the chase has nothing to do
+    """
+    rng = random.Random(seed)
+    attributes = generate_attributes(num_attributes)
+    relation_width = max(2, min(relation_width, num_attributes))
+    decompositions = [set(rng.sample(attributes, relation_width))]
+    for _ in range(num_relations - 1):
+        shared = rng.choice(sorted(set().union(*decompositions)))
+        others = rng.sample([attribute for attribute in attributes if attribute != shared], relation_width - 1)
+        decompositions.append({shared, *others})
+    # every attribute shows up in some relation, adding to a relation keeps it connected
+    for attribute in attributes:
+        if not any(attribute in decomposition for decomposition in decompositions):
+            rng.choice(decompositions).add(attribute)
+    return [sorted(decomposition) for decomposition in decompositions]
+
+
+def to_lossless_checker_input(dependencies: list[str], decompositions: list[list]) -> tuple[list[list], dict]:
+    """
+    Convert to the input format of LosslessDecompositionChecker, fds only
+    'A,B->C' -> ['AB', 'C'], ['A', 'B'] -> {'R1(A,B)': ['A', 'B']}
+    """
+    functional_dependencies = []
+    for d in dependencies:
+        assert "->>" not in d, "LosslessDecompositionChecker only supports functional dependencies"
+        x, y = d.split("->")
+        functional_dependencies.append([x.replace(",", ""), y.replace(",", "")])
+    named_decompositions = {f"R{i + 1}({','.join(decomposition)})": decomposition
+                            for i, decomposition in enumerate(decompositions)}
+    return functional_dependencies, named_decompositions
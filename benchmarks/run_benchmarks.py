@@ -0,0 +1,137 @@
+"""
+Time the chase engines on seeded random workloads, recording wall time, peak memory and final tableau size.
+
+Usage:
+python -m benchmarks.run_benchmarks --attributes 6 10 16 --dependencies 5 10 20 --mvd-ratio 0 0.3 --json bench.json
+python -m benchmarks.run_benchmarks --attributes 12 --relations 3 6 --relation-width 3 5
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from itertools import product
+
+from tabulate import tabulate
+
+from benchmarks.generators import generate_attributes, generate_decompositions, generate_dependencies, \
+    generate_desired_dependency, to_lossless_checker_input
+from chase_checking_lossless_decomposition import LosslessDecompositionChecker
+from chase_with_distinguished_variables import DistinguishedVariableChaseChecker
+from simple_chase import SimpleChaseChecker
+
+ENGINES = ["simple", "simple-restricted", "lossless", "distinguished-pandas", "distinguished-pandas-restricted",
+           "distinguished-numpy", "distinguished-numpy-restricted"]
+
+
+def make_run(engine: str, workload: dict):
+    """
+    :return: function running one chase from scratch and returning its ChaseResult,
+             None if the engine cannot solve this workload
+    """
+    attributes, dependencies = workload["attributes"], workload["dependencies"]
+    if engine.startswith("simple"):
+        return lambda: SimpleChaseChecker(restricted=engine.endswith("restricted"), attributes=attributes,
+                                          dependencies=dependencies, desired_dependency=workload["desired"],
+                                          verbose=False).run_simple_chase_algorithm()
+    if engine == "lossless":
+        if any("->>" in d for d in dependencies):
+            return None
+        functional_dependencies, decompositions = to_lossless_checker_input(dependencies, workload["decompositions"])
+        return lambda: LosslessDecompositionChecker(attributes, functional_dependencies, decompositions,
+                                                    verbose=False).run_chase_algorithm()
+    # distinguished variables chase checks the decomposition
+    return lambda: DistinguishedVariableChaseChecker(engine="numpy" if "numpy" in engine else "pandas",
+                                                     restricted=engine.endswith("restricted"), option=1,
+                                                     attributes=attributes, dependencies=dependencies,
+                                                     desired=workload["decompositions"],
+                                                     verbose=False).run_chase_algorithm()
+
+
+def measure(run, repeat: int) -> dict:
+    """
+    Best wall time of repeat runs, then one more run under tracemalloc for the peak memory
+    :param repeat: at least 1
+    """
+    assert repeat >= 1, "at least one timed run"
+    best_time = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        best_time = min(best_time, time.perf_counter() - start)
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"success": bool(result.success), "steps": result.steps, "rows": len(result.table),
+            "time_ms": round(best_time * 1000, 3), "peak_kb": round(peak / 1024, 1)}
+
+
+def generate_workloads(num_attributes_list, num_dependencies_list, lhs_widths, mvd_ratios, seeds,
+                       num_relations_list=(None,), relation_widths=(None,)):
+    """
+    :param num_relations_list: relation counts of the decompositions, None for a third of the attributes
+    :param relation_widths: attributes per relation, None for a third of the attributes plus one
+    """
+    for num_attributes, num_dependencies, lhs_width, mvd_ratio, seed, num_relations, relation_width in product(
+            num_attributes_list, num_dependencies_list, lhs_widths, mvd_ratios, seeds, num_relations_list,
+            relation_widths):
+        if lhs_width + 1 > num_attributes:
+            continue
+        num_relations = num_relations or max(2, num_attributes // 3)
+        relation_width = min(relation_width or max(2, num_attributes // 3 + 1), num_attributes)
+        yield {
+            "num_attributes": num_attributes, "num_dependencies": num_dependencies, "lhs_width": lhs_width,
+            "mvd_ratio": mvd_ratio, "num_relations": num_relations, "relation_width": relation_width, "seed": seed,
+            "attributes": generate_attributes(num_attributes),
+            "dependencies": generate_dependencies(num_attributes, num_dependencies, lhs_width, 1, mvd_ratio, seed),
+            "desired": generate_desired_dependency(num_attributes, lhs_width, False, seed),
+            "decompositions": generate_decompositions(num_attributes, num_relations, relation_width, seed),
+        }
+
+
+def run_benchmarks(workloads, engines, repeat: int = 3) -> list[dict]:
+    records = []
+    for workload in workloads:
+        for engine in engines:
+            run = make_run(engine, workload)
+            if run is None:
+                continue
+            record = {key: workload[key] for key in ["num_attributes", "num_dependencies", "lhs_width", "mvd_ratio",
+                                                     "num_relations", "relation_width", "seed"]}
+            record["engine"] = engine
+            record.update(measure(run, repeat))
+            records.append(record)
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the chase engines on seeded random workloads")
+    parser.add_argument("--attributes", type=int, nargs="+", default=[4, 8, 12], help="attribute counts")
+    parser.add_argument("--dependencies", type=int, nargs="+", default=[4, 8, 16], help="dependency counts")
+    parser.add_argument("--lhs-width", type=int, nargs="+", default=[1, 2], help="lhs widths")
+    parser.add_argument("--mvd-ratio", type=float, nargs="+", default=[0.0, 0.25], help="fractions of mvds")
+    parser.add_argument("--relations", type=int, nargs="+", default=[None],
+                        help="relations per decomposition, default a third of the attributes")
+    parser.add_argument("--relation-width", type=int, nargs="+", default=[None],
+                        help="attributes per relation, default a third of the attributes plus one")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0], help="random seeds")
+    parser.add_argument("--engines", nargs="+", default=ENGINES, choices=ENGINES, help="engines to time")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case, the best time is kept")
+    parser.add_argument("--json", help="write the records to this file to compare runs later")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat should be at least 1")
+
+    workloads = generate_workloads(args.attributes, args.dependencies, args.lhs_width, args.mvd_ratio, args.seeds,
+                                   args.relations, args.relation_width)
+    records = run_benchmarks(workloads, args.engines, args.repeat)
+    print(tabulate(records, headers="keys", tablefmt="github"))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
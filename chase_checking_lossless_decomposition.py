@@ -8,42 +8,117 @@ Copyright 2024 Xie Yuan
 import re
 from typing import Any
 from tabulate import tabulate
+from common import ChaseResult
+from chase_stats import ChaseStats
 
 
-class LosslessDecompositionChecker:
+class SymbolUnionFind:
+    """
+    Union-find over tableau symbols like 'a' and 'a1'.
+    Equating two symbols merges their classes, and every cell reads its value through find().
+    Whether a class is distinguished (no subscript) is kept on its root.
+    """
+
     def __init__(self):
+        self.parent = {}
+        self.size = {}
+        # root -> symbol shown for the whole class
+        self.label = {}
+        # root -> if the class contains a distinguished symbol
+        self.distinguished = {}
+
+    def add(self, symbol: str, distinguished: bool) -> None:
+        self.parent[symbol] = symbol
+        self.size[symbol] = 1
+        self.label[symbol] = symbol
+        self.distinguished[symbol] = distinguished
+
+    def find(self, symbol: str) -> str:
+        root = symbol
+        while self.parent[root] != root:
+            root = self.parent[root]
+        # path compression
+        while self.parent[symbol] != root:
+            self.parent[symbol], symbol = root, self.parent[symbol]
+        return root
+
+    def union(self, symbol1: str, symbol2: str) -> bool:
+        """
+        Equate two symbols. The distinguished symbol wins, otherwise symbol1 wins
+        :return: if two different classes are merged
+        """
+        root1, root2 = self.find(symbol1), self.find(symbol2)
+        if root1 == root2:
+            return False
+        label = self.label[root2] if self.distinguished[root2] and not self.distinguished[root1] else self.label[root1]
+        distinguished = self.distinguished[root1] or self.distinguished[root2]
+        # union by size, the smaller tree goes under the larger one
+        if self.size[root1] < self.size[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        self.size[root1] += self.size[root2]
+        self.label[root1] = label
+        self.distinguished[root1] = distinguished
+        return True
+
+    def value(self, symbol: str) -> str:
+        return self.label[self.find(symbol)]
+
+    def is_distinguished(self, symbol: str) -> bool:
+        return self.distinguished[self.find(symbol)]
+
+
+class LosslessDecompositionChecker:
+    def __init__(self, attributes: list = None, functional_dependencies: list[list] = None,
+                 decompositions: dict[Any, list[Any]] = None, verbose: bool = True, stats: ChaseStats = None):
+        """
+        Problem parts left as None are read with input()
+        :param attributes: e.g. ['A', 'B', 'C', 'D', 'E', 'F']
+        :param functional_dependencies: e.g. [['B', 'E'], ['EF', 'C'], ['BC', 'A'], ['AD', 'E']]
+        :param decompositions: e.g. {'R1(A,B,C,F)': ['A', 'B', 'C', 'F'], 'R2(A,D,E)': ['A', 'D', 'E']}
+        :param verbose: print every step, set False to run headless
+        :param stats: collector recording every tried fd, None to skip the instrumentation
+        """
         # Taking input from the user
-        # attributes = ['A', 'B', 'C', 'D', 'E', 'F']
-        # functional_dependencies = [['B', 'E'], ['EF', 'C'], ['BC', 'A'], ['AD', 'E']]
-        # decompositions = {'R1(A,B,C,F)': ['A', 'B', 'C', 'F'], 'R2(A,D,E)': ['A', 'D', 'E'], 'R3(B,D,F)': ['B', 'D', 'F']}
-        self.attributes = self.input_attributes()
-        self.functional_dependencies = self.input_functional_dependencies()
-        self.decompositions = self.input_decompositions()
+        self.verbose = verbose
+        self.stats = stats
+        self.attributes = self.input_attributes() if attributes is None else list(attributes)
+        self.functional_dependencies = self.input_functional_dependencies() if functional_dependencies is None \
+            else [list(fd) for fd in functional_dependencies]
+        self.decompositions = self.input_decompositions() if decompositions is None else dict(decompositions)
         self.table = self.generate_initial_state()
-        self.print_table()
+        if self.verbose:
+            self.print_table()
         
     def generate_initial_state(self):
+        """
+        Each cell keeps its initial symbol, the current value is read through self.symbols
+        """
+        self.symbols = SymbolUnionFind()
         table = {key: {} for key in self.decompositions}
         for attr in self.attributes:
             for index, key in enumerate(table.keys()):
-                table[key][attr] = attr.lower() if attr in self.decompositions[key] else attr.lower() + str(
-                    index + 1)
-        print("Initial Tuples:")
+                distinguished = attr in self.decompositions[key]
+                table[key][attr] = attr.lower() if distinguished else attr.lower() + str(index + 1)
+                if table[key][attr] not in self.symbols.parent:
+                    self.symbols.add(table[key][attr], distinguished)
+        self.log("Initial Tuples:")
         return table
 
-    def apply_functional_dependencies(self, fd: list) -> tuple[dict[str, dict], str | None] | None:
+    def apply_functional_dependencies(self, fd: list) -> str | None:
         """
         Process each fd as in current iteration. Find two tuple with same x, make y the same
+        by merging the symbol classes of their y values
         :param fd:
-        :return: modified table
+        :return: key of the updated row, None if no two rows match
         """
         x_attributes, y_attribute = fd
         rows_with_same_attributes = None
         seen_attribute_values = {}
 
-        print(f"Matching two rows with same attributes '{x_attributes}'...")
-        for key, row in self.table.items():
-            attribute_values = tuple(row.get(attr) for attr in x_attributes)
+        self.log(f"Matching two rows with same attributes '{x_attributes}'...")
+        for rows_scanned, (key, row) in enumerate(self.table.items(), 1):
+            attribute_values = tuple(self.symbols.find(row[attr]) for attr in x_attributes)
             if attribute_values in seen_attribute_values:
                 matching_key = seen_attribute_values[attribute_values]
                 matching_row = self.table[matching_key]
@@ -51,40 +126,36 @@ class LosslessDecompositionChecker:
                 break
             else:
                 seen_attribute_values[attribute_values] = key
+        if self.stats is not None:
+            self.stats.count(rows_scanned=rows_scanned)
 
         # no two rows with same x_attributes value
         if not rows_with_same_attributes:
-            print(f"No matching rows with same attributes '{x_attributes}' is found")
+            self.log(f"No matching rows with same attributes '{x_attributes}' is found")
             return None
 
         # print(f"Row 1: {matching_key}, Row 1 values: {matching_row}")
         # print(f"Row 2: {key}, Row 2 values: {row}")
-        print(f"Found matching rows with same attributes '{x_attributes}', make their attribute '{y_attribute}' the same")
+        self.log(f"Found matching rows with same attributes '{x_attributes}', make their attribute '{y_attribute}' the same")
         # print the two rows with same attributes
         matching_key, matching_row, key, row = rows_with_same_attributes
 
-        y_value1 = self.table[matching_key][y_attribute]
-        y_value2 = self.table[key][y_attribute]
-
-        # if y_value1 and y_value2 both have subscript, make second value same as first value
-        # if one y_attribute value has not subscript, make two value no subscript
-        has_subscript1 = self.check_if_str_has_subscript(y_value1)
-        has_subscript2 = self.check_if_str_has_subscript(y_value2)
-
-        # y_value1 and y_value2 both have subscript
-        updated_row_key = None
-        if has_subscript1 and has_subscript2:
-            self.table[key][y_attribute] = y_value1
-            updated_row_key = key
-        # y_value1 has subscript and y_value2 has no subscript
-        elif has_subscript1 and not has_subscript2:
-            self.table[matching_key][y_attribute] = y_value2
-            updated_row_key = matching_key
-        # y_value1 has no subscript and y_value2 has subscript
-        elif not has_subscript1 and has_subscript2:
-            self.table[key][y_attribute] = y_value1
-            updated_row_key = key
-        return updated_row_key
+        # if one y value has no subscript, its class wins, otherwise the first row's value wins
+        for attr in y_attribute:
+            merged = self.symbols.union(self.table[matching_key][attr], self.table[key][attr])
+            if merged and self.stats is not None:
+                self.stats.count(cells_equated=1)
+        return key
+
+    def log(self, *args) -> None:
+        if self.verbose:
+            print(*args)
+
+    def get_table(self) -> dict[str, dict]:
+        """
+        Current tableau with every cell read through its symbol class, e.g. {'R1(A,C)': {'A': 'a', 'B': 'b1'}}
+        """
+        return {key: {attr: self.symbols.value(value) for attr, value in row.items()} for key, row in self.table.items()}
 
     def print_table(self) -> None:
         """
@@ -103,34 +174,44 @@ class LosslessDecompositionChecker:
         headers = ['Decomposition'] + sorted(values[0].keys())
         table = []
         for key, value in zip(keys, values):
-            row = [key] + [value[attr] for attr in sorted(value.keys())]
+            row = [key] + [self.symbols.value(value[attr]) for attr in sorted(value.keys())]
             table.append(row)
         print(tabulate(table, headers, tablefmt="grid"))
 
-    def run_chase_algorithm(self) -> None:
+    def run_chase_algorithm(self) -> ChaseResult:
+        """
+        Main chase algorithm
+        :return: verdict, number of applied fds and final tableau
+        """
+        success = False
+        steps = 0
         # Start iterations
         for i, fd in enumerate(self.functional_dependencies):
-            print("\nApplying the {} Functional Dependencies: {} -> {}".format(i+1, fd[0], fd[1]))
+            self.log("\nApplying the {} Functional Dependencies: {} -> {}".format(i+1, fd[0], fd[1]))
+            if self.stats is not None:
+                self.stats.begin_step(f"{fd[0]}->{fd[1]}")
             result = self.apply_functional_dependencies(fd)
+            if self.stats is not None:
+                self.stats.end_step(result is not None, len(self.table))
             if not result:
-                print("\nFunctional Dependency is violated, lossy decomposition!!!")
+                self.log("\nFunctional Dependency is violated, lossy decomposition!!!")
                 break
 
-            updated_row_key = result
-            print("\nTuples after Applying Functional Dependencies:")
-            self.print_table()
+            steps += 1
+            self.log("\nTuples after Applying Functional Dependencies:")
+            if self.verbose:
+                self.print_table()
+
+            # check if any row has no subscript at all, equating symbols may update rows other than the matched two
+            if self.if_found_row_without_subscript():
+                self.log("\nCongrats! No violation found in decompositions! Decomposition is lossless!!!")
+                success = True
+                break
+        return ChaseResult(success, steps, self.get_table())
 
-            # check if updated row has no subscript at all
-            if updated_row_key:
-                no_subscript = True
-                updated_row = self.table[updated_row_key]  # {'A': 'a', 'B': 'b', 'C': 'c'}
-                for value in updated_row.values():
-                    if self.check_if_str_has_subscript(value):
-                        no_subscript = False
-                        break
-                if no_subscript:
-                    print("\nCongrats! No violation found in decompositions! Decomposition is lossless!!!")
-                    break
+    def if_found_row_without_subscript(self) -> bool:
+        return any(all(self.symbols.is_distinguished(value) for value in row.values())
+                   for row in self.table.values())
 
     @staticmethod
     def input_attributes() -> list:
@@ -4,11 +4,17 @@ Date: 2024-03-22
 """
 
 
+import os
+import sys
+import tempfile
 from tkinter import *
 import re
 from tkinter import messagebox
 from typing import Any
 from tabulate import tabulate
+from tableau_grid import TableDelta, TableauGrid
+from chase_runner import ChaseRunner, DONE, CANCELLED
+from chase_trace import TraceReader, TraceWriter, record_trace
 
 
 class LosslessDecompositionChecker:
@@ -21,6 +27,8 @@ class LosslessDecompositionChecker:
         self.functional_dependencies = self.input_functional_dependencies(fd)
         self.decompositions = self.input_decompositions(de)
         self.table = self.generate_initial_state()
+        # cell changed by the last step
+        self.delta = TableDelta()
         # self.print_table()
 
     def generate_initial_state(self):
@@ -87,6 +95,8 @@ class LosslessDecompositionChecker:
         elif not has_subscript1 and has_subscript2:
             self.table[key][y_attribute] = y_value1
             updated_row_key = key
+        if updated_row_key:
+            self.delta.change_cell(updated_row_key, y_attribute, self.table[updated_row_key][y_attribute])
         return updated_row_key, output_str
 
     def return_table(self) -> str:
@@ -110,12 +120,27 @@ class LosslessDecompositionChecker:
             table.append(row)
         return tabulate(table, headers, tablefmt="grid")
 
+    def get_rows(self) -> list[tuple]:
+        """
+        (decomposition key, values in sorted attribute order) of each row, to fill a TableauGrid once
+        """
+        return [(key, [value[attr] for attr in sorted(value.keys())]) for key, value in self.table.items()]
+
+    def record_trace(self, path: str, snapshot_every: int = 64) -> int:
+        """
+        Run the chase to the end and record it as a binary trace, to browse it later
+        :return: number of steps
+        """
+        return record_trace(self.chase_generator(), path, sorted(self.attributes), self.get_rows(), "Decomposition",
+                            snapshot_every)
+
     def chase_generator(self):
         # Start iterations
         for i, fd in enumerate(self.functional_dependencies):
             # print("\nApplying the {} Functional Dependencies: {} -> {}".format(i + 1, fd[0], fd[1]))
             a = "\nApplying the {} Functional Dependencies: {} -> {}".format(i + 1, fd[0], fd[1])
             yield a
+            self.delta = TableDelta(f"{fd[0]}->{fd[1]}")
             result_all = self.apply_functional_dependencies(fd)
             result = result_all[0]
             output_str = result_all[1]
@@ -129,8 +154,8 @@ class LosslessDecompositionChecker:
             updated_row_key = result
             c = "\nTuples after Applying Functional Dependencies:"
             # print("\nTuples after Applying Functional Dependencies:")
-            d = self.return_table()
-            yield c, d
+            # only the cell changed by this step, the view patches its grid
+            yield c, self.delta
 
             # check if updated row has no subscript at all
             if updated_row_key:
@@ -202,6 +227,7 @@ class View:
         self.model = model
         self.save_data = save_data
         self.handle_start_process_click = handle_start_process_click
+        self.grid = None
         my_font = ("Arial", 12)
         self.main_frame = Frame(root)
         self.lb1 = Label(self.main_frame, text='Please enter the number of attributes', font=my_font)
@@ -240,53 +266,233 @@ class View:
         second_button = Button(self.second_frame, text="Start Chase Algorithm", command=self.handle_start_process_click)
         second_label.pack()
         second_button.pack()
-        self.second_txt = Text(self.second_frame, width=80, height=40)
+        # the tableau is filled once, then each step only patches its changed cell
+        self.grid = TableauGrid(self.second_frame, sorted(self.model.attributes), index_header="Decomposition")
+        self.grid.load(self.model.checker.get_rows())
+        self.second_txt = Text(self.second_frame, width=80, height=25)
 
         a = "Attributes list: {}".format(', '.join(self.model.attributes))
         self.second_txt.insert(END, a + '\n')
-        b = "Initial Tuples:"
+        b = "Initial Tuples are shown in the table."
         self.second_txt.insert(END, b + '\n')
-        c = self.model.checker.return_table()
-        self.second_txt.insert(END, c)
+        self.grid.pack()
+        self.second_txt.pack()
+        self.second_frame.pack()
+
+    def show_trace(self, trace):
+        """
+        Browse a recorded trace, without entering the inputs
+        """
+        self.main_frame.pack_forget()
+        self.second_frame = Frame(self.root)
+        Label(self.second_frame, text="Browsing a recorded trace").pack()
+        self.grid = TableauGrid(self.second_frame, trace.columns, index_header=trace.index_header)
+        self.second_txt = Text(self.second_frame, width=80, height=25)
+        self.grid.pack()
         self.second_txt.pack()
         self.second_frame.pack()
 
 
 class Controller:
-    def __init__(self, root, model):
+    def __init__(self, root, model, trace_path: str = None):
+        self.root = root
         self.model = model
         self.view = View(root, model, self.save_data, self.handle_start_process_click)
         self.generator = None
+        self.runner = None
+        self.steps_per_sec = None
+        self.step_number = None
         self.running = True
         self.start_process = None
+        # recorded trace, browsed forward and backward once the live chase stops
+        self.trace = None
+        self.trace_path = None
+        self.trace_step = 0
+        self.playing = None
+        # the live chase records its trace here, removed when the window closes
+        self.trace_dir = tempfile.TemporaryDirectory(prefix="chase-", ignore_cleanup_errors=True)
+        root.protocol("WM_DELETE_WINDOW", self.close)
+        if trace_path:
+            self.running = False
+            self.trace = TraceReader(trace_path)
+            self.view.show_trace(self.trace)
+            self.add_buttons()
+            self.go_to(0)
+
+    def add_buttons(self):
+        buttons = Frame(self.view.second_frame)
+        Button(buttons, text='Back', command=self.back).pack(side=LEFT)
+        Button(buttons, text='Next Step', command=self.next_step).pack(side=LEFT)
+        Button(buttons, text='Run to end', command=self.run_to_end).pack(side=LEFT)
+        self.steps_per_sec = Spinbox(buttons, from_=1, to=100, width=4)
+        self.steps_per_sec.pack(side=LEFT)
+        Button(buttons, text='Play steps/sec', command=self.play).pack(side=LEFT)
+        Button(buttons, text='Pause', command=self.pause).pack(side=LEFT)
+        Button(buttons, text='Cancel', command=self.cancel).pack(side=LEFT)
+        self.step_number = Spinbox(buttons, from_=0, to=1000000, width=8)
+        self.step_number.pack(side=LEFT)
+        Button(buttons, text='Go to step', command=self.go_to_step).pack(side=LEFT)
+        buttons.pack()
 
     def handle_start_process_click(self):
         if self.start_process:
             messagebox.showinfo("Info", "Already started!")
             return
-        next_step_button = Button(self.view.second_frame, text='Next Step', command=self.next_step)
-        next_step_button.pack()
+        # the chase runs on a worker thread, the buttons only send requests to it
+        self.add_buttons()
         self.start_process = True
         checker = self.model.checker
         self.generator = checker.chase_generator()
+        # every step is recorded, so it can be browsed back when the chase stops
+        self.trace_path = os.path.join(self.trace_dir.name, "chase.trace")
+        trace = TraceWriter(self.trace_path, sorted(self.model.attributes), checker.get_rows(), self.view.grid.index_header)
+        self.runner = ChaseRunner(self.generator, self.root, self.show_frame, self.finish, trace=trace)
+        self.runner.start()
         self.running = True
 
     def next_step(self):
-        if self.running:
-            try:
-                next_value = next(self.generator)
-                if type(next_value) == tuple:
-                    self.view.second_txt.insert(END, next_value[0] + '\n')
-                    self.view.second_txt.insert(END, next_value[1] + '\n')
-                    self.view.second_txt.see(END)
-                else:
-                    self.view.second_txt.insert(END, next_value + '\n')
-                    self.view.second_txt.see(END)
-            except StopIteration:
-                self.running = False
+        if self.trace is not None:
+            if self.trace_step < len(self.trace):
+                self.forward()
+            else:
                 messagebox.showinfo("Info", "process completed!")
+        elif self.running:
+            self.runner.step()
         elif self.running is False:
             messagebox.showinfo("Info", "process completed!")
+
+    def back(self):
+        if self.trace is None:
+            messagebox.showinfo("Info", "Steps can be browsed back when the chase is completed or cancelled!")
+        elif self.trace_step > 0:
+            self.backward()
+
+    def run_to_end(self):
+        if self.trace is not None:
+            self.go_to(len(self.trace))
+        elif self.running:
+            self.runner.run_to_end()
+
+    def read_steps_per_sec(self):
+        try:
+            steps_per_sec = float(self.steps_per_sec.get())
+        except ValueError:
+            messagebox.showinfo("Info", "steps/sec should be a number!")
+            return None
+        if steps_per_sec <= 0:
+            messagebox.showinfo("Info", "steps/sec should be positive!")
+            return None
+        return steps_per_sec
+
+    def play(self):
+        if self.trace is None and not self.running:
+            return
+        steps_per_sec = self.read_steps_per_sec()
+        if steps_per_sec is None:
+            return
+        if self.trace is None:
+            self.runner.play(steps_per_sec)
+            return
+        self.pause()
+
+        def tick():
+            if self.trace_step < len(self.trace):
+                self.forward()
+                self.playing = self.root.after(int(1000 / steps_per_sec), tick)
+            else:
+                self.playing = None
+
+        tick()
+
+    def pause(self):
+        if self.trace is not None:
+            if self.playing is not None:
+                self.root.after_cancel(self.playing)
+                self.playing = None
+        elif self.running:
+            self.runner.pause()
+
+    def cancel(self):
+        if self.trace is not None:
+            self.pause()
+        elif self.running:
+            self.runner.cancel()
+
+    def go_to_step(self):
+        if self.trace is None:
+            messagebox.showinfo("Info", "Steps can be browsed when the chase is completed or cancelled!")
+            return
+        try:
+            step = int(self.step_number.get())
+        except ValueError:
+            messagebox.showinfo("Info", "step should be an integer!")
+            return
+        if not 0 <= step <= len(self.trace):
+            messagebox.showinfo("Info", f"step should be between 0 and {len(self.trace)}!")
+            return
+        self.go_to(step)
+
+    def trace_header(self) -> str:
+        return "Attributes list: {}\nInitial Tuples are shown in the table.\n".format(', '.join(self.trace.columns))
+
+    def forward(self):
+        self.trace_step += 1
+        self.view.second_txt.insert(END, self.trace.message(self.trace_step) + '\n')
+        self.view.second_txt.see(END)
+        if self.trace.changes_table(self.trace_step):
+            self.view.grid.apply_delta(self.trace.delta(self.trace_step, len(self.view.grid.data)))
+
+    def backward(self):
+        # drop the message of the current step, the text ends with it
+        message = self.trace.message(self.trace_step)
+        self.view.second_txt.delete(f"end-{len(message) + 2}c", "end-1c")
+        self.trace_step -= 1
+        self.view.grid.load(self.trace.rows(self.trace_step))
+
+    def go_to(self, step: int):
+        """
+        Show the tableau after step, loaded from the nearest snapshot of the trace
+        """
+        self.trace_step = step
+        self.view.second_txt.delete("1.0", END)
+        self.view.second_txt.insert(END, self.trace_header() +
+                                "".join(self.trace.message(i) + '\n' for i in range(1, step + 1)))
+        self.view.second_txt.see(END)
+        self.view.grid.load(self.trace.rows(step))
+
+    def show_frame(self, text, delta):
+        """
+        Steps drained in one poll, text of all steps and their merged TableDelta
+        """
+        self.view.second_txt.insert(END, text)
+        self.view.second_txt.see(END)
+        if delta:
+            self.view.grid.apply_delta(delta)
+
+    def close(self):
+        """
+        Stop the chase and remove its recorded trace with the window
+        """
+        if self.runner is not None:
+            self.runner.cancel()
+        if self.trace is not None:
+            self.trace.close()
+        self.trace_dir.cleanup()
+        self.root.destroy()
+
+    def finish(self, status, error):
+        self.running = False
+        if status == DONE:
+            messagebox.showinfo("Info", "process completed!")
+        elif status == CANCELLED:
+            messagebox.showinfo("Info", "process cancelled!")
+        else:
+            messagebox.showerror("Error", f"process failed: {error}")
+            return
+        # browse the recorded steps from here, the row labels of the trace replace the live ones
+        self.trace = TraceReader(self.trace_path)
+        self.trace_step = len(self.trace)
+        self.view.grid.load(self.trace.rows(self.trace_step))
     def save_data(self):
         num_attributes = self.model.inp1
         dependency = self.model.inp2
@@ -305,5 +511,6 @@ if __name__ == "__main__":
     root.geometry('1280x650')
     root.title('The Chase Algorithm')
     model = Model()
-    app = Controller(root, model)
+    # python chase_checking_lossless_decomposition_GUI.py run.trace browses a trace recorded by record_trace
+    app = Controller(root, model, sys.argv[1] if len(sys.argv) > 1 else None)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""
+Checkpoints of long running chases, so a pre-empted run resumes instead of starting from the initial tuples.
+A checkpoint holds the tableau, the pending worklist and the step counter of one problem. It is written to a
+temporary file and renamed over the previous one, so a crash while saving keeps the last complete checkpoint.
+Checkpoints are pickled, only load files written by this module.
+"""
+
+import os
+import pickle
+import time
+
+CHECKPOINT_VERSION = 1
+
+
+class ChaseCheckpointer:
+    def __init__(self, path: str, every_steps: int = None, every_seconds: float = None):
+        """
+        A checkpoint is due when either limit is reached since the last one, at least one should be set
+        :param path: checkpoint file, resumed from if it exists
+        :param every_steps: applied dependencies between two checkpoints
+        :param every_seconds: seconds between two checkpoints
+        """
+        assert every_steps is not None or every_seconds is not None
+        self.path = path
+        self.every_steps = every_steps
+        self.every_seconds = every_seconds
+        self.last_steps = 0
+        self.last_time = time.monotonic()
+        # number of checkpoints written by this run
+        self.saved = 0
+
+    def due(self, steps: int) -> bool:
+        if self.every_steps is not None and steps - self.last_steps >= self.every_steps:
+            return True
+        return self.every_seconds is not None and time.monotonic() - self.last_time >= self.every_seconds
+
+    def save(self, problem: dict, table, worklist: list[str], steps: int) -> None:
+        """
+        :param problem: problem the chase solves, a checkpoint of another problem is never resumed
+        :param table: tableau, DataFrame or IntTableau
+        :param worklist: pending dependencies in queue order
+        """
+        state = {"version": CHECKPOINT_VERSION, "problem": problem, "table": table, "worklist": list(worklist),
+                 "steps": steps}
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self.last_steps = steps
+        self.last_time = time.monotonic()
+        self.saved += 1
+
+    def load(self, problem: dict) -> dict | None:
+        """
+        :return: state with table, worklist and steps, None if there is no checkpoint yet
+        """
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Checkpoint {self.path} has version {state.get('version')}, "
+                             f"expected {CHECKPOINT_VERSION}")
+        if state["problem"] != problem:
+            raise ValueError(f"Checkpoint {self.path} belongs to another problem: {state['problem']}")
+        self.last_steps = state["steps"]
+        self.last_time = time.monotonic()
+        return state
+
+    def remove(self) -> None:
+        """
+        The chase is finished, the next run starts from the initial tuples
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
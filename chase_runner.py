@@ -0,0 +1,145 @@
+"""
+Run a chase generator on a worker thread, so a heavy step does not freeze the Tk window.
+The worker puts every yielded value into a queue.Queue and the UI drains it with root.after polling.
+Values drained in one poll are coalesced into one text insert and one TableDelta.
+"""
+
+import queue
+import threading
+
+from tableau_grid import TableDelta
+
+# the worker puts (FINISHED, status, error) after the last value
+FINISHED = object()
+DONE = "done"
+CANCELLED = "cancelled"
+ERROR = "error"
+
+
+def coalesce(values) -> tuple[str, TableDelta]:
+    """
+    Merge the values of several steps into one frame
+    :param values: str, or (str, TableDelta) of a step that changed the tableau
+    :return: messages joined by lines, merged delta
+    """
+    lines = []
+    delta = TableDelta()
+    for value in values:
+        if type(value) == tuple:
+            lines.append(value[0])
+            delta.merge(value[1])
+        else:
+            lines.append(value)
+    return "".join(line + '\n' for line in lines), delta
+
+
+class ChaseRunner:
+    def __init__(self, generator, root, on_frame, on_finish, poll_ms: int = 50, trace=None):
+        """
+        :param generator: chase generator, only advanced on the worker thread
+        :param root: any Tk widget, used for after polling
+        :param on_frame: on_frame(text, delta) on the Tk thread for each drained batch
+        :param on_finish: on_finish(status, error) on the Tk thread, status is DONE, CANCELLED or ERROR
+        :param trace: TraceWriter recording every value on the worker thread, closed when the worker stops
+        """
+        self.generator = generator
+        self.root = root
+        self.on_frame = on_frame
+        self.on_finish = on_finish
+        self.poll_ms = poll_ms
+        self.trace = trace
+        self.events = queue.Queue()
+        # "step" waits for step() requests, "run" runs to the end, "play" runs at steps_per_sec
+        self.mode = "step"
+        self.pending_steps = 0
+        self.interval = 0.0
+        self.cancelled = False
+        self.finished = False
+        self.condition = threading.Condition()
+        self.worker = threading.Thread(target=self.work, daemon=True)
+
+    def start(self) -> None:
+        self.worker.start()
+        self.root.after(self.poll_ms, self.poll)
+
+    def work(self) -> None:
+        status, error = DONE, None
+        try:
+            while True:
+                with self.condition:
+                    while True:
+                        while not self.cancelled and self.mode == "step" and not self.pending_steps:
+                            self.condition.wait()
+                        if self.cancelled or self.mode != "play":
+                            break
+                        # woken early by cancel or a mode change
+                        self.condition.wait(self.interval)
+                        if self.mode == "play":
+                            break
+                        # paused during the wait, wait for step requests again
+                    if self.cancelled:
+                        status = CANCELLED
+                        break
+                    if self.mode == "step" and self.pending_steps > 0:
+                        self.pending_steps -= 1
+                try:
+                    value = next(self.generator)
+                except StopIteration:
+                    break
+                if self.trace is not None:
+                    self.trace.add(value)
+                self.events.put(value)
+        except Exception as e:
+            status, error = ERROR, e
+        finally:
+            self.generator.close()
+            if self.trace is not None:
+                self.trace.close()
+            self.events.put((FINISHED, status, error))
+
+    def poll(self) -> None:
+        values = []
+        finish = None
+        while True:
+            try:
+                value = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if type(value) == tuple and value[0] is FINISHED:
+                finish = value[1:]
+                break
+            values.append(value)
+        if values:
+            self.on_frame(*coalesce(values))
+        if finish:
+            self.finished = True
+            self.on_finish(*finish)
+        else:
+            self.root.after(self.poll_ms, self.poll)
+
+    def set_mode(self, mode: str, interval: float = 0.0) -> None:
+        with self.condition:
+            self.mode = mode
+            self.interval = interval
+            self.condition.notify()
+
+    def step(self) -> None:
+        with self.condition:
+            self.pending_steps += 1
+            self.condition.notify()
+
+    def run_to_end(self) -> None:
+        self.set_mode("run")
+
+    def play(self, steps_per_sec: float) -> None:
+        self.set_mode("play", 1 / steps_per_sec)
+
+    def pause(self) -> None:
+        with self.condition:
+            self.pending_steps = 0
+        self.set_mode("step")
+
+    def cancel(self) -> None:
+        with self.condition:
+            self.cancelled = True
+            self.condition.notify()
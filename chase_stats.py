@@ -0,0 +1,73 @@
+"""
+Opt-in per-step instrumentation for the chase engines.
+Pass a ChaseStats to a checker and every dependency it tries is recorded with its counters and elapsed time.
+"""
+
+import json
+import time
+
+from tabulate import tabulate
+
+
+class ChaseStats:
+    def __init__(self):
+        # one dict per tried dependency, in order
+        self.steps = []
+        self.current = None
+        self.start_time = None
+
+    def begin_step(self, dependency: str) -> None:
+        self.current = {"step": len(self.steps) + 1, "dependency": dependency, "fired": False, "rows_scanned": 0,
+                        "cells_equated": 0, "rows_appended": 0, "table_size": 0, "elapsed_ms": 0.0}
+        self.start_time = time.perf_counter()
+
+    def count(self, rows_scanned: int = 0, cells_equated: int = 0, rows_appended: int = 0) -> None:
+        """
+        Add to the counters of the current step, ignored outside a step
+        """
+        if self.current is None:
+            return
+        self.current["rows_scanned"] += rows_scanned
+        self.current["cells_equated"] += cells_equated
+        self.current["rows_appended"] += rows_appended
+
+    def end_step(self, fired: bool, table_size: int) -> None:
+        if self.current is None:
+            return
+        self.current["elapsed_ms"] = (time.perf_counter() - self.start_time) * 1000
+        self.current["fired"] = bool(fired)
+        self.current["table_size"] = table_size
+        self.steps.append(self.current)
+        self.current = None
+
+    def summary(self) -> list[dict]:
+        """
+        Totals per dependency, the slowest first
+        """
+        totals = {}
+        for step in self.steps:
+            total = totals.setdefault(step["dependency"], {
+                "dependency": step["dependency"], "tries": 0, "fires": 0, "rows_scanned": 0, "cells_equated": 0,
+                "rows_appended": 0, "elapsed_ms": 0.0})
+            total["tries"] += 1
+            total["fires"] += step["fired"]
+            for key in ["rows_scanned", "cells_equated", "rows_appended", "elapsed_ms"]:
+                total[key] += step[key]
+        return sorted(totals.values(), key=lambda total: total["elapsed_ms"], reverse=True)
+
+    def summary_table(self) -> str:
+        return tabulate(self.summary(), headers="keys", tablefmt="grid", floatfmt=".3f")
+
+    def print_summary(self) -> None:
+        print(self.summary_table())
+
+    def to_json(self, path: str = None) -> str:
+        """
+        :param path: also write the json to this file
+        :return: steps and summary as a json string
+        """
+        text = json.dumps({"steps": self.steps, "summary": self.summary()}, ensure_ascii=False, indent=2)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
@@ -0,0 +1,366 @@
+"""
+Compact binary trace of a chase run, for precomputing runs offline and browsing them in the GUIs.
+The trace is the initial tableau, one record per yielded step (cell equations, row appends, dependency id),
+full snapshots every few steps and a seek index at the end, so step N is loaded from the nearest snapshot
+instead of replaying from step 0.
+
+Layout, numbers are varints and strings are ids into the string table of the index:
+    MAGIC
+    records   SNAPSHOT: kind, step, number of rows, values of each row
+              STEP: kind, dependency id + 1 (0 for none), changed cells (position, column, value),
+                    appended rows (values)
+    index     strings, index header, columns, row labels, dependencies,
+              (offset gap, message) of each step, (step, offset) of each snapshot
+    footer    offset of the index (8 bytes little endian), MAGIC
+"""
+
+import bisect
+import struct
+
+from tableau_grid import TableDelta, TableauRows
+
+MAGIC = b"CHTR1"
+SNAPSHOT = 1
+STEP = 2
+# a step only yielded a message, the tableau is unchanged
+MESSAGE = 3
+
+
+def write_varint(buffer: bytearray, n: int) -> None:
+    while n >= 0x80:
+        buffer.append(n & 0x7f | 0x80)
+        n >>= 7
+    buffer.append(n)
+
+
+def read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    """
+    :return: value, offset after it
+    """
+    n = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        n |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return n, offset
+        shift += 7
+
+
+class TraceWriter:
+    def __init__(self, path: str, columns, rows, index_header: str = "", snapshot_every: int = 64):
+        """
+        :param columns: attribute columns of the tableau
+        :param rows: initial tableau, (row, values) as given to TableauGrid.load
+        :param snapshot_every: most steps between two snapshots, a snapshot is also written once the deltas
+        since the last one hold as many cells as the tableau
+        """
+        self.file = open(path, "wb")
+        self.file.write(MAGIC)
+        self.snapshot_every = snapshot_every
+        self.strings = {}
+        self.dependencies = {}
+        self.data = TableauRows(columns)
+        self.labels = []
+        self.step_offsets = []
+        self.step_messages = []
+        self.snapshots = []
+        self.steps_since_snapshot = 0
+        self.cells_since_snapshot = 0
+        self.index_header = self.string_id(index_header)
+        self.column_ids = [self.string_id(column) for column in self.data.columns]
+        for row, values in rows:
+            self.add_row(row, values)
+        self.write_snapshot()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self.step_offsets)
+
+    def string_id(self, string) -> int:
+        string = str(string)
+        if string not in self.strings:
+            self.strings[string] = len(self.strings)
+        return self.strings[string]
+
+    def dependency_id(self, dependency: str) -> int:
+        if dependency not in self.dependencies:
+            self.dependencies[dependency] = len(self.dependencies)
+            self.string_id(dependency)
+        return self.dependencies[dependency]
+
+    def add_row(self, row, values) -> int:
+        self.labels.append(self.string_id(row))
+        return self.data.append(row, values)
+
+    def write_values(self, buffer: bytearray, values) -> None:
+        for value in values:
+            write_varint(buffer, self.string_id(value))
+
+    def write_snapshot(self) -> None:
+        buffer = bytearray()
+        write_varint(buffer, SNAPSHOT)
+        write_varint(buffer, len(self))
+        write_varint(buffer, len(self.data))
+        for row, values in self.data.rows:
+            self.write_values(buffer, values)
+        self.snapshots.append((len(self), self.file.tell()))
+        self.file.write(buffer)
+        self.steps_since_snapshot = 0
+        self.cells_since_snapshot = 0
+
+    def add_step(self, message: str, delta: TableDelta = None) -> None:
+        """
+        Record one value yielded by a chase generator, delta is None if only a message was yielded
+        """
+        buffer = bytearray()
+        if delta is None:
+            write_varint(buffer, MESSAGE)
+        else:
+            write_varint(buffer, STEP)
+            write_varint(buffer, 0 if delta.dependency is None else self.dependency_id(delta.dependency) + 1)
+            write_varint(buffer, len(delta.changed_cells))
+            for row, column, value in delta.changed_cells:
+                write_varint(buffer, self.data.positions[row])
+                write_varint(buffer, self.data.column_position[column])
+                write_varint(buffer, self.string_id(value))
+                self.data.rows[self.data.positions[row]][1][self.data.column_position[column]] = value
+            write_varint(buffer, len(delta.appended_rows))
+            for row, values in delta.appended_rows:
+                self.add_row(row, values)
+                self.write_values(buffer, values)
+            self.cells_since_snapshot += len(delta.changed_cells) + len(delta.appended_rows) * len(self.column_ids)
+        self.step_offsets.append(self.file.tell())
+        self.step_messages.append(self.string_id(message))
+        self.file.write(buffer)
+        self.steps_since_snapshot += 1
+        if delta is not None and (self.steps_since_snapshot >= self.snapshot_every or
+                                  self.cells_since_snapshot >= len(self.data) * len(self.column_ids)):
+            self.write_snapshot()
+
+    def add(self, value) -> None:
+        """
+        Record a value as yielded by chase_generator, a str or (str, TableDelta)
+        """
+        if type(value) == tuple:
+            self.add_step(value[0], value[1])
+        else:
+            self.add_step(value)
+
+    def close(self) -> None:
+        if self.file.closed:
+            return
+        index_offset = self.file.tell()
+        buffer = bytearray()
+        write_varint(buffer, len(self.strings))
+        for string in self.strings:
+            encoded = string.encode("utf-8")
+            write_varint(buffer, len(encoded))
+            buffer += encoded
+        write_varint(buffer, self.index_header)
+        write_varint(buffer, len(self.column_ids))
+        for column_id in self.column_ids:
+            write_varint(buffer, column_id)
+        write_varint(buffer, len(self.labels))
+        for label in self.labels:
+            write_varint(buffer, label)
+        write_varint(buffer, len(self.dependencies))
+        for dependency in self.dependencies:
+            write_varint(buffer, self.strings[dependency])
+        write_varint(buffer, len(self.step_offsets))
+        previous = 0
+        for offset, message in zip(self.step_offsets, self.step_messages):
+            write_varint(buffer, offset - previous)
+            write_varint(buffer, message)
+            previous = offset
+        write_varint(buffer, len(self.snapshots))
+        for step, offset in self.snapshots:
+            write_varint(buffer, step)
+            write_varint(buffer, offset)
+        self.file.write(buffer)
+        self.file.write(struct.pack("<Q", index_offset) + MAGIC)
+        self.file.close()
+
+
+class TraceReader:
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        if self.file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a chase trace")
+        self.file.seek(-8 - len(MAGIC), 2)
+        footer = self.file.read()
+        if footer[8:] != MAGIC:
+            raise ValueError(f"{path} is not a complete chase trace")
+        index_offset = struct.unpack("<Q", footer[:8])[0]
+        self.end_offset = self.file.seek(-8 - len(MAGIC), 2)
+        self.file.seek(index_offset)
+        data = self.file.read(self.end_offset - index_offset)
+        self.records_end = index_offset
+
+        n, offset = read_varint(data, 0)
+        self.strings = []
+        for _ in range(n):
+            length, offset = read_varint(data, offset)
+            self.strings.append(data[offset:offset + length].decode("utf-8"))
+            offset += length
+        header, offset = read_varint(data, offset)
+        self.index_header = self.strings[header]
+        ids, offset = self.read_ids(data, offset)
+        self.columns = [self.strings[i] for i in ids]
+        ids, offset = self.read_ids(data, offset)
+        self.labels = [self.strings[i] for i in ids]
+        ids, offset = self.read_ids(data, offset)
+        self.dependencies = [self.strings[i] for i in ids]
+        n, offset = read_varint(data, offset)
+        self.step_offsets = []
+        self.messages = []
+        previous = 0
+        for _ in range(n):
+            gap, offset = read_varint(data, offset)
+            message, offset = read_varint(data, offset)
+            previous += gap
+            self.step_offsets.append(previous)
+            self.messages.append(self.strings[message])
+        n, offset = read_varint(data, offset)
+        self.snapshot_steps = []
+        self.snapshot_offsets = []
+        for _ in range(n):
+            step, offset = read_varint(data, offset)
+            snapshot_offset, offset = read_varint(data, offset)
+            self.snapshot_steps.append(step)
+            self.snapshot_offsets.append(snapshot_offset)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        """
+        Number of steps, steps are numbered from 1 and step 0 is the initial tableau
+        """
+        return len(self.step_offsets)
+
+    @staticmethod
+    def read_ids(data: bytes, offset: int) -> tuple[list[int], int]:
+        n, offset = read_varint(data, offset)
+        ids = []
+        for _ in range(n):
+            i, offset = read_varint(data, offset)
+            ids.append(i)
+        return ids, offset
+
+    def read_record(self, offset: int) -> bytes:
+        """
+        A record ends where the next record, step or snapshot, begins
+        """
+        following = [self.records_end]
+        i = bisect.bisect_right(self.step_offsets, offset)
+        if i < len(self.step_offsets):
+            following.append(self.step_offsets[i])
+        i = bisect.bisect_right(self.snapshot_offsets, offset)
+        if i < len(self.snapshot_offsets):
+            following.append(self.snapshot_offsets[i])
+        self.file.seek(offset)
+        return self.file.read(min(following) - offset)
+
+    def read_values(self, data: bytes, offset: int) -> tuple[list[str], int]:
+        values = []
+        for _ in self.columns:
+            value, offset = read_varint(data, offset)
+            values.append(self.strings[value])
+        return values, offset
+
+    def message(self, step: int) -> str:
+        return self.messages[step - 1]
+
+    def changes_table(self, step: int) -> bool:
+        """
+        False if the step only yielded a message
+        """
+        return read_varint(self.read_record(self.step_offsets[step - 1]), 0)[0] == STEP
+
+    def read_step(self, step: int):
+        """
+        :return: dependency or None, changed cells (position, column position, value), appended rows values
+        """
+        data = self.read_record(self.step_offsets[step - 1])
+        kind, offset = read_varint(data, 0)
+        if kind == MESSAGE:
+            return None, [], []
+        dependency, offset = read_varint(data, offset)
+        n, offset = read_varint(data, offset)
+        changed_cells = []
+        for _ in range(n):
+            position, offset = read_varint(data, offset)
+            column, offset = read_varint(data, offset)
+            value, offset = read_varint(data, offset)
+            changed_cells.append((position, column, self.strings[value]))
+        n, offset = read_varint(data, offset)
+        appended_rows = []
+        for _ in range(n):
+            values, offset = self.read_values(data, offset)
+            appended_rows.append(values)
+        return self.dependencies[dependency - 1] if dependency else None, changed_cells, appended_rows
+
+    def dependency(self, step: int) -> str:
+        return self.read_step(step)[0]
+
+    def delta(self, step: int, first_row: int) -> TableDelta:
+        """
+        TableDelta of one step, to patch a grid showing the tableau before it
+        :param first_row: number of rows before the step, positions of the appended rows start from it
+        """
+        dependency, changed_cells, appended_rows = self.read_step(step)
+        delta = TableDelta(dependency)
+        for i, values in enumerate(appended_rows):
+            delta.append_row(self.labels[first_row + i], values)
+        for position, column, value in changed_cells:
+            delta.change_cell(self.labels[position], self.columns[column], value)
+        return delta
+
+    def values(self, step: int) -> list[list[str]]:
+        """
+        Values of each row after the step, loaded from the nearest snapshot before it
+        """
+        i = bisect.bisect_right(self.snapshot_steps, step) - 1
+        data = self.read_record(self.snapshot_offsets[i])
+        kind, offset = read_varint(data, 0)
+        snapshot_step, offset = read_varint(data, offset)
+        n, offset = read_varint(data, offset)
+        rows = []
+        for _ in range(n):
+            values, offset = self.read_values(data, offset)
+            rows.append(values)
+        for later_step in range(snapshot_step + 1, step + 1):
+            dependency, changed_cells, appended_rows = self.read_step(later_step)
+            rows += appended_rows
+            for position, column, value in changed_cells:
+                rows[position][column] = value
+        return rows
+
+    def rows(self, step: int) -> list[tuple]:
+        """
+        (row, values) after the step, as given to TableauGrid.load
+        """
+        return list(zip(self.labels, self.values(step)))
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def record_trace(generator, path: str, columns, rows, index_header: str = "", snapshot_every: int = 64) -> int:
+    """
+    Run a chase generator to the end and record every yielded value
+    :return: number of steps
+    """
+    with TraceWriter(path, columns, rows, index_header, snapshot_every) as writer:
+        for value in generator:
+            writer.add(value)
+        return len(writer)
@@ -0,0 +1,71 @@
+"""
+Semi-naive worklist scheduler for the chase.
+A dependency is only tried again when a column it reads changed since it was last tried,
+and the chase reaches its fixpoint when the worklist is empty.
+An fd reads its lhs and rhs columns: equating cells of one group does not rename the symbol everywhere,
+so a changed rhs cell can make two rows with the same lhs differ again. An mvd reads every column,
+its swapped rows are new as soon as any column of a row changed.
+"""
+
+from collections import deque
+
+
+def split_dependency(d: str) -> tuple[list[str], list[str]]:
+    """
+    'A,B->>C' -> (['A', 'B'], ['C']), 'D->C' -> (['D'], ['C'])
+    """
+    x, y = d.split("->>" if "->>" in d else "->")
+    return x.split(","), y.split(",")
+
+
+class ChaseWorklist:
+    def __init__(self, dependencies, pending=None):
+        """
+        :param dependencies: dependency strings like 'A->>B,C' or 'D->C', all enqueued in order
+        :param pending: dependencies still queued, in queue order, when resuming from a checkpoint
+        """
+        self.dependencies = list(dependencies)
+        # attribute -> fds whose lhs or rhs contains the attribute
+        self.dependencies_by_attribute = {}
+        # mvds are tried again after any change
+        self.mvds = []
+        for d in self.dependencies:
+            if "->>" in d:
+                self.mvds.append(d)
+                continue
+            xs, ys = split_dependency(d)
+            for attribute in dict.fromkeys(xs + ys):
+                self.dependencies_by_attribute.setdefault(attribute, []).append(d)
+        self.queue = deque(self.dependencies if pending is None else pending)
+        self.queued = set(self.queue)
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __bool__(self):
+        return bool(self.queue)
+
+    def pop(self) -> str:
+        d = self.queue.popleft()
+        self.queued.discard(d)
+        return d
+
+    def get_pending(self) -> list[str]:
+        return list(self.queue)
+
+    def push(self, d: str) -> None:
+        if d not in self.queued:
+            self.queue.append(d)
+            self.queued.add(d)
+
+    def notify_changed(self, columns) -> None:
+        """
+        Re-enqueue only the dependencies reading the changed columns
+        """
+        if not columns:
+            return
+        for column in columns:
+            for d in self.dependencies_by_attribute.get(column, []):
+                self.push(d)
+        for d in self.mvds:
+            self.push(d)
@@ -7,6 +7,23 @@ def print_df_pretty(df):
     # Print the table
     print(table)
 
+class ChaseResult:
+    """
+    Outcome of one chase run, returned by the checkers without printing
+    success: if the desired dependency holds or the decomposition is lossless
+    steps: number of dependency applications that changed the tableau
+    table: final tableau
+    """
+
+    def __init__(self, success: bool, steps: int, table):
+        self.success = success
+        self.steps = steps
+        self.table = table
+
+    def __repr__(self):
+        return f"ChaseResult(success={self.success}, steps={self.steps}, rows={len(self.table)})"
+
+
 def get_all_subsets(list, cur_subset, index, max_attrs):
     '''
     Use recursion to generate all possible subsets of a given list,
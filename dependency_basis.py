@@ -0,0 +1,119 @@
+"""
+Implication of fds and mvds by the dependency basis (Beeri's algorithm), without building any tableau.
+The dependency basis of X is the partition of U - X into blocks such that X->>Y holds iff Y - X is a union
+of blocks. Each fd V->W is also used as the mvds V->>A for A in W, then X->A holds iff A is in X, or {A}
+is a block and A is in the rhs of some fd V->W with A not in V.
+Polynomial in the number of attributes and dependencies, use it when only the verdict is needed,
+the chase checkers stay for showing the steps.
+
+Usage:
+python dependency_basis.py 4 "A->>B,C;D->C" "A->C" "A->>B"
+"""
+
+import argparse
+
+from chase_worklist import split_dependency
+from fd_closure import from_bitmask, get_attribute_bits, to_bitmask
+
+
+class DependencyBasisChecker:
+    def __init__(self, attributes: list, dependencies):
+        """
+        :param attributes: e.g. ['A', 'B', 'C', 'D']
+        :param dependencies: e.g. ['A->>B,C', 'D->C']
+        """
+        self.attributes = list(attributes)
+        self.dependencies = list(dependencies)
+        self.attribute_bits = get_attribute_bits(self.attributes)
+        self.all_bits = to_bitmask(self.attributes, self.attribute_bits)
+        # (lhs mask, rhs mask) of each mvd, fds included as one mvd per rhs attribute
+        self.mvds = []
+        # attributes in the rhs of an fd whose lhs does not contain them
+        self.fd_rhs = 0
+        for d in self.dependencies:
+            xs, ys = split_dependency(d)
+            lhs, rhs = self.to_bitmask(xs), self.to_bitmask(ys) & ~self.to_bitmask(xs)
+            if "->>" in d:
+                self.mvds.append((lhs, rhs))
+            else:
+                self.fd_rhs |= rhs
+                for attribute in ys:
+                    bit = self.attribute_bits[attribute]
+                    if bit & rhs:
+                        self.mvds.append((lhs, bit))
+        # lhs mask -> basis blocks, a validation run asks many dependencies with the same lhs
+        self.bases = {}
+
+    def to_bitmask(self, attributes) -> int:
+        return to_bitmask(attributes, self.attribute_bits)
+
+    def basis_bits(self, x: int) -> list[int]:
+        """
+        Blocks of U - X, refined until no mvd V->>W with V disjoint from a block Y splits Y into Y & W, Y - W
+        """
+        if x in self.bases:
+            return self.bases[x]
+        rest = self.all_bits & ~x
+        blocks = [rest] if rest else []
+        changed = True
+        while changed:
+            changed = False
+            for v, w in self.mvds:
+                refined = []
+                for y in blocks:
+                    if not y & v and y & w and y & ~w:
+                        refined += [y & w, y & ~w]
+                        changed = True
+                    else:
+                        refined.append(y)
+                blocks = refined
+        self.bases[x] = blocks
+        return blocks
+
+    def dependency_basis(self, xs) -> list[list[str]]:
+        """
+        e.g. ['A'] with A->>B -> [['B'], ['C', 'D']], attributes of X are not listed
+        """
+        return [sorted(from_bitmask(block, self.attribute_bits)) for block in self.basis_bits(self.to_bitmask(xs))]
+
+    def implies_mvd(self, xs, ys) -> bool:
+        x = self.to_bitmask(xs)
+        y = self.to_bitmask(ys) & ~x
+        return all(block & y == 0 or block & ~y == 0 for block in self.basis_bits(x))
+
+    def implies_fd(self, xs, ys) -> bool:
+        x = self.to_bitmask(xs)
+        y = self.to_bitmask(ys) & ~x
+        if y & ~self.fd_rhs:
+            return False
+        singletons = 0
+        for block in self.basis_bits(x):
+            if block & (block - 1) == 0:
+                singletons |= block
+        return y & ~singletons == 0
+
+    def implies(self, d: str) -> bool:
+        """
+        If the dependencies imply d, e.g. 'A->C' or 'A->>B,C'
+        """
+        xs, ys = split_dependency(d.strip())
+        return self.implies_mvd(xs, ys) if "->>" in d else self.implies_fd(xs, ys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decide fd/mvd implication with the dependency basis")
+    parser.add_argument("attributes", type=int, help="number of attributes from 'A'")
+    parser.add_argument("dependencies", help="dependencies separated by ';', e.g. A->>B,C;D->C")
+    parser.add_argument("desired", nargs="+", help="desired dependencies, e.g. A->C A->>B")
+    args = parser.parse_args()
+
+    attributes = [chr(ord('A') + i) for i in range(args.attributes)]
+    checker = DependencyBasisChecker(attributes, [d.strip() for d in args.dependencies.split(";")])
+    for d in args.desired:
+        xs, _ = split_dependency(d)
+        print(f"{d}: {'valid' if checker.implies(d) else 'invalid'}, dependency basis of {','.join(xs)}: "
+              f"{checker.dependency_basis(xs)}")
+
+
+if __name__ == "__main__":
+    main()
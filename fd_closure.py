@@ -0,0 +1,204 @@
+"""
+Linear time attribute closure (LINCLOSURE) over a precompiled set of functional dependencies.
+Attributes are interned to bit positions, so every attribute set is an int bitmask.
+Closures can be memoized in a bounded LRU ClosureCache, keyed by (fd set fingerprint, attribute bitmask).
+"""
+
+from collections import OrderedDict
+
+
+def get_attribute_bits(attributes) -> dict:
+    """
+    Intern each attribute to a bit position, e.g. ['A', 'B', 'C'] -> {'A': 1, 'B': 2, 'C': 4}
+    """
+    return {attribute: 1 << i for i, attribute in enumerate(sorted(set(attributes)))}
+
+
+def to_bitmask(attributes, attribute_bits: dict) -> int:
+    """
+    Convert a collection of attributes to an int bitmask, e.g. {'A', 'C'} -> 0b101
+    """
+    mask = 0
+    for attribute in attributes:
+        mask |= attribute_bits[attribute]
+    return mask
+
+
+def from_bitmask(mask: int, attribute_bits: dict) -> set:
+    """
+    Convert an int bitmask back to a set of attributes, e.g. 0b101 -> {'A', 'C'}
+    """
+    return {attribute for attribute, bit in attribute_bits.items() if mask & bit}
+
+
+class FDIndex:
+    """
+    Precompiled fds for closure computation.
+    Each fd keeps a counter of lhs attributes not yet in the closure, and each attribute
+    keeps the list of fds whose lhs contains it, so one closure costs O(total fd size).
+    """
+
+    def __init__(self, fds, attributes=()):
+        """
+        :param fds: a list of fd, each fd is [lhs, rhs] or (lhs, rhs) with iterable sides
+        :param attributes: extra attributes to intern, e.g. attributes not shown in fds
+        """
+        self.fds = [(list(lhs), list(rhs)) for lhs, rhs in fds]
+        all_attributes = list(attributes)
+        for lhs, rhs in self.fds:
+            all_attributes += lhs + rhs
+        self.attribute_bits = get_attribute_bits(all_attributes)
+        self.lhs_masks = [self.to_bitmask(lhs) for lhs, _ in self.fds]
+        self.rhs_masks = [self.to_bitmask(rhs) for _, rhs in self.fds]
+        self.lhs_sizes = [lhs_mask.bit_count() for lhs_mask in self.lhs_masks]
+        # attribute bit position -> ids of fds whose lhs contains the attribute
+        self.fds_by_attribute = [[] for _ in self.attribute_bits]
+        for i, lhs_mask in enumerate(self.lhs_masks):
+            for position in self.iter_positions(lhs_mask):
+                self.fds_by_attribute[position].append(i)
+        # fds like {}->A always fire
+        self.unconditional_rhs = 0
+        for lhs_size, rhs_mask in zip(self.lhs_sizes, self.rhs_masks):
+            if lhs_size == 0:
+                self.unconditional_rhs |= rhs_mask
+        # same attributes and same fds give same closures, whatever the fd order
+        self.fingerprint = (tuple(self.attribute_bits), frozenset(zip(self.lhs_masks, self.rhs_masks)))
+
+    def to_bitmask(self, attributes) -> int:
+        return to_bitmask(attributes, self.attribute_bits)
+
+    def from_bitmask(self, mask: int) -> set:
+        return from_bitmask(mask, self.attribute_bits)
+
+    @staticmethod
+    def iter_positions(mask: int):
+        """
+        Yield the bit positions set in mask, lowest first
+        """
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def closure_bits(self, mask: int) -> int:
+        """
+        LINCLOSURE on bitmasks
+        mask: bitmask of attributes like 0b10001 for {'A', 'E'}
+        """
+        missing = self.lhs_sizes.copy()
+        closure = mask | self.unconditional_rhs
+        pending = closure
+        while pending:
+            low = pending & -pending
+            pending ^= low
+            for i in self.fds_by_attribute[low.bit_length() - 1]:
+                missing[i] -= 1
+                if missing[i] == 0:
+                    # every lhs attribute is in the closure, add the new rhs attributes
+                    new = self.rhs_masks[i] & ~closure
+                    closure |= new
+                    pending |= new
+        return closure
+
+    def closure(self, attributes) -> set:
+        """
+        attributes: set of attribute like {'A', 'E'}, attributes unknown to the fds stay as they are
+        """
+        attributes = set(attributes)
+        known = [attribute for attribute in attributes if attribute in self.attribute_bits]
+        return attributes | self.from_bitmask(self.closure_bits(self.to_bitmask(known)))
+
+    def implies(self, lhs, rhs) -> bool:
+        """
+        Check if lhs->rhs can be derived from the fds
+        """
+        return set(rhs).issubset(self.closure(lhs))
+
+
+class LRUCache:
+    """
+    Dict bounded to maxsize entries, the least recently used entry is evicted first
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        self.misses += 1
+        return default
+
+    def put(self, key, value) -> None:
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self.entries),
+                "maxsize": self.maxsize}
+
+
+class ClosureCache:
+    """
+    Closures shared across callers, keyed by (fd set fingerprint, attribute bitmask).
+    A changed fd set has a new fingerprint, so its old entries are never hit again and age out.
+    """
+
+    def __init__(self, maxsize: int = 65536, max_indexes: int = 256):
+        self.closures = LRUCache(maxsize)
+        # fds and attributes as given -> FDIndex, so repeated calls skip compiling the fds
+        self.indexes = LRUCache(max_indexes)
+
+    def get_index(self, fds, attributes=()) -> FDIndex:
+        key = (tuple((tuple(lhs), tuple(rhs)) for lhs, rhs in fds), tuple(sorted(set(attributes))))
+        fd_index = self.indexes.get(key)
+        if fd_index is None:
+            fd_index = FDIndex(fds, attributes)
+            self.indexes.put(key, fd_index)
+        return fd_index
+
+    def closure_bits(self, fd_index: FDIndex, mask: int) -> int:
+        key = (fd_index.fingerprint, mask)
+        closure = self.closures.get(key)
+        if closure is None:
+            closure = fd_index.closure_bits(mask)
+            self.closures.put(key, closure)
+        return closure
+
+    def closure(self, fd_index: FDIndex, attributes) -> set:
+        """
+        Same as FDIndex.closure, memoized
+        """
+        attributes = set(attributes)
+        known = [attribute for attribute in attributes if attribute in fd_index.attribute_bits]
+        return attributes | fd_index.from_bitmask(self.closure_bits(fd_index, fd_index.to_bitmask(known)))
+
+    def clear(self) -> None:
+        self.closures.clear()
+        self.indexes.clear()
+
+    def stats(self) -> dict:
+        return self.closures.stats()
+
+
+# shared by min_cover, is_redundant and the normal form checks
+closure_cache = ClosureCache()
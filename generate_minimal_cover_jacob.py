@@ -1,5 +1,6 @@
 from itertools import combinations
 from collections import OrderedDict
+from fd_closure import FDIndex, closure_cache, get_attribute_bits, to_bitmask
 
 
 def get_all_attributes(fds: list[list]) -> list:
@@ -30,40 +31,66 @@ def get_all_attributes(fds: list[list]) -> list:
 
 def cal_attribute_closure(attributes: set, fds: list[list]):
     """
-    It is a fix point algorithm
-    attribute: set of attribute like {'A', 'E'}
+    Linear time closure, see fd_closure.FDIndex, memoized in fd_closure.closure_cache
+    attribute: set of attribute like {'A', 'E'}, attributes not in fds stay as they are
     fds: a list of fd
     """
-    closure = attributes.copy()
-    changed = True
-    while changed:
-        changed = False
-        for lhs, rhs in fds:
-            if set(lhs).issubset(closure) and not set(rhs).issubset(closure):
-                # union
-                closure.update(rhs)
-                changed = True
-    return closure
+    # one index per fd set, whatever attributes are asked
+    return closure_cache.closure(closure_cache.get_index(fds), attributes)
 
 
-def cal_combination_attribute_closure(all_attributes, fds: list[list], continue_same_length=True, continue_longer_length=False):
+def classify_attributes(all_attributes, fds: list[list]) -> tuple[list, list, list, list]:
+    """
+    Split attributes by the fd sides they appear on
+    :return: lhs only (in every key), rhs only (in no key), both sides, neither side (in every key)
+    """
+    lhs_attributes, rhs_attributes = set(), set()
+    for fd in fds:
+        lhs, rhs = fd
+        lhs_attributes.update(lhs)
+        rhs_attributes.update(rhs)
+    lhs_only, rhs_only, both, neither = [], [], [], []
+    for attribute in all_attributes:
+        if attribute in lhs_attributes:
+            (both if attribute in rhs_attributes else lhs_only).append(attribute)
+        else:
+            (rhs_only if attribute in rhs_attributes else neither).append(attribute)
+    return lhs_only, rhs_only, both, neither
+
+
+def cal_combination_attribute_closure(all_attributes, fds: list[list], continue_same_length=True, continue_longer_length=False,
+                                      prune=False):
     """
     Generate combinations of attributes until superkey is found
+    :param prune: only search superkeys, every combination holds the lhs only and neither side attributes
+                  and adds attributes on both sides, rhs only attributes are never tried
     """
     # all_attributes = get_all_attributes(fds)
+    fd_index = closure_cache.get_index(fds, all_attributes)
+    all_attributes_mask = fd_index.to_bitmask(all_attributes)
+    if prune:
+        lhs_only, _, both, neither = classify_attributes(all_attributes, fds)
+        core, candidates, sizes = lhs_only + neither, both, range(len(both) + 1)
+    else:
+        core, candidates, sizes = [], all_attributes, range(1, len(all_attributes))
     combs = OrderedDict()
     superkeys = []
-    for i in range(len(all_attributes) - 1):
+    superkey_masks = []
+    for size in sizes:
         found_superkey = False
-        for comb in combinations(all_attributes, i + 1):
+        for comb in combinations(candidates, size):
+            if core:
+                comb = tuple(sorted(core + list(comb)))
+            comb_mask = fd_index.to_bitmask(comb)
             # comb is tuple type, comb contain any superkey is a superkey
-            if any(set(superkey).issubset(comb) for superkey in superkeys):
+            if any(superkey_mask & ~comb_mask == 0 for superkey_mask in superkey_masks):
                 continue
-            attribute_closure = cal_attribute_closure(set(comb), fds)
-            combs[tuple(sorted(comb))] = attribute_closure
+            closure_mask = closure_cache.closure_bits(fd_index, comb_mask)
+            combs[tuple(sorted(comb))] = fd_index.from_bitmask(closure_mask)
             # check if comb is superkey
-            if attribute_closure == set(all_attributes):
+            if all_attributes_mask & ~closure_mask == 0:
                 superkeys.append(comb)
+                superkey_masks.append(comb_mask)
                 found_superkey = True
                 # continue same length attributes check
                 if not continue_same_length:
@@ -73,6 +100,43 @@ def cal_combination_attribute_closure(all_attributes, fds: list[list], continue_
     return superkeys, combs
 
 
+def find_candidate_keys(all_attributes, fds: list[list]) -> list[tuple]:
+    """
+    Lucchesi-Osborn: each new key is derived from a known key K and a fd X->Y as a minimized X ∪ (K - Y),
+    so the work is polynomial in the number of keys instead of exponential in the number of attributes
+    :return: all candidate keys as sorted tuples, shortest first
+    """
+    fd_index = closure_cache.get_index(fds, all_attributes)
+    all_attributes_mask = fd_index.to_bitmask(all_attributes)
+    # lhs only and neither side attributes are in every key, rhs only attributes in none
+    lhs_only, _, both, neither = classify_attributes(all_attributes, fds)
+    core_mask = fd_index.to_bitmask(lhs_only + neither)
+    both_mask = fd_index.to_bitmask(both)
+
+    def is_superkey(mask):
+        return all_attributes_mask & ~closure_cache.closure_bits(fd_index, mask) == 0
+
+    def minimize(mask):
+        # drop each attribute on both sides whose removal keeps a superkey
+        for position in FDIndex.iter_positions(mask & both_mask):
+            smaller_mask = mask & ~(1 << position)
+            if is_superkey(smaller_mask):
+                mask = smaller_mask
+        return mask
+
+    key_masks = [minimize(core_mask | both_mask)]
+    # key_masks grows while it is iterated, every key is expanded once
+    for key_mask in key_masks:
+        for lhs_mask, rhs_mask in zip(fd_index.lhs_masks, fd_index.rhs_masks):
+            mask = lhs_mask | (key_mask & ~rhs_mask)
+            # mask contains a known key, it cannot give a new one
+            if any(known_mask & ~mask == 0 for known_mask in key_masks):
+                continue
+            key_masks.append(minimize(mask))
+    keys = [tuple(sorted(fd_index.from_bitmask(key_mask))) for key_mask in key_masks]
+    return sorted(keys, key=lambda key: (len(key), key))
+
+
 def is_redundant(fd, fds):
     """
     Check if fd can be derived from other fds
@@ -84,9 +148,10 @@ def is_redundant(fd, fds):
     # remove fd from fds first
     remaining_fds.remove(fd)
     X, Y = fd
-    closure = cal_attribute_closure(set(X), remaining_fds)
+    fd_index = closure_cache.get_index(remaining_fds, get_all_attributes(fds))
+    closure = closure_cache.closure_bits(fd_index, fd_index.to_bitmask(X))
     # after apply other fds, whether we find X->Y, which is Y in closure of X
-    return set(Y).issubset(closure)
+    return fd_index.to_bitmask(Y) & ~closure == 0
 
 
 def remove_duplicate_fds(fds):
@@ -120,40 +185,92 @@ def get_compact_min_cover(fds):
     return compact_fds
 
 
-def min_cover(all_attributes, fds):
-    print(f"Original dependencies: \n{fds}")
+def reduce_lhs_mask(fd_index: FDIndex, lhs_mask: int, rhs_mask: int) -> int:
+    """
+    Drop lhs attributes one at a time while the remaining lhs still determines rhs
+    """
+    for position in FDIndex.iter_positions(lhs_mask):
+        smaller_mask = lhs_mask & ~(1 << position)
+        if smaller_mask and rhs_mask & ~closure_cache.closure_bits(fd_index, smaller_mask) == 0:
+            lhs_mask = smaller_mask
+    return lhs_mask
 
-    # Step 1: Decompose the right-hand side (RHS) of each dependency
-    fds1 = []
-    for fd in fds:
-        lhs, rhs = fd
-        for rhs_attribute in rhs:
-            fds1.append([lhs, [rhs_attribute]])
-    print(f"After minimize RHS: \n{fds1}")
 
-    # Step 2: Minimize the left-hand side (LHS) of each dependency
+def reduce_lhs(all_attributes, fds1, lhs_reduction="lattice"):
+    """
+    Step 2 of the minimal cover, fds1 have a single rhs attribute
+    :param lhs_reduction: "lattice" picks the first subset of lhs whose closure contains rhs,
+                          from the closures of the whole subset lattice.
+                          "greedy" drops lhs attributes one at a time while the rest still determines rhs,
+                          |lhs| closures per fd and nothing exponential kept in memory
+    :return: fds with minimized lhs, trivial and duplicate fds removed
+    """
+    assert lhs_reduction in ["lattice", "greedy"]
+    if lhs_reduction == "greedy":
+        fd_index = closure_cache.get_index(fds1, all_attributes)
+        fds2 = []
+        for fd in fds1:
+            lhs, rhs = fd
+            rhs_mask = fd_index.to_bitmask(rhs)
+            lhs_mask = fd_index.to_bitmask(lhs)
+            # remove trivial dependency, e.g. A,B->A
+            if rhs_mask & ~lhs_mask == 0:
+                continue
+            fds2.append([sorted(fd_index.from_bitmask(reduce_lhs_mask(fd_index, lhs_mask, rhs_mask))), rhs])
+        # remove duplicate fd
+        return remove_duplicate_fds(fds2)
+
     # Calculate attribute closure
     _, attribute_closures = cal_combination_attribute_closure(all_attributes, fds1)
+    attribute_bits = get_attribute_bits(list(all_attributes) + get_all_attributes(fds1))
+    closure_bits = [(attributes_set, to_bitmask(attributes_set, attribute_bits), to_bitmask(closure, attribute_bits))
+                    for attributes_set, closure in attribute_closures.items()]
     fds2 = []
     for fd in fds1:
         lhs, rhs = fd
+        rhs_mask = to_bitmask(rhs, attribute_bits)
         # remove trivial dependency, e.g. A,B->A
-        if set(rhs).issubset(set(lhs)):
+        if rhs_mask & ~to_bitmask(lhs, attribute_bits) == 0:
             continue
         # lhs is already minimized
         if len(lhs) == 1:
             fds2.append(fd)
         # lhs is not minimized
         else:
-            # find first attribute closure which contains rhs
-            for attributes_set, closure in attribute_closures.items():
-                # e.g. 'F' should not be in attributes_set, this is trivial
-                if set(rhs).issubset(closure) and (not set(rhs).issubset(attributes_set)):
+            lhs_mask = to_bitmask(lhs, attribute_bits)
+            # find first subset of lhs whose closure contains rhs
+            for attributes_set, attributes_mask, closure_mask in closure_bits:
+                if attributes_mask & ~lhs_mask == 0 and rhs_mask & ~closure_mask == 0:
                     fds2.append([sorted(list(attributes_set)), rhs])
                     break
+            else:
+                # the lattice stops at the size of the smallest key, larger subsets of lhs are not in it
+                fd_index = closure_cache.get_index(fds1, all_attributes)
+                fds2.append([sorted(fd_index.from_bitmask(
+                    reduce_lhs_mask(fd_index, fd_index.to_bitmask(lhs), fd_index.to_bitmask(rhs)))), rhs])
     # remove duplicate fd
-    fds2 = remove_duplicate_fds(fds2)
-    print(f"After minimize LHS: \n{fds2}")
+    return remove_duplicate_fds(fds2)
+
+
+def min_cover(all_attributes, fds, verbose=True, lhs_reduction="lattice"):
+    """
+    Compute one minimal cover of fds
+    :param verbose: print each step, set False to run headless
+    :param lhs_reduction: "lattice" or "greedy", see reduce_lhs
+    """
+    if verbose: print(f"Original dependencies: \n{fds}")
+
+    # Step 1: Decompose the right-hand side (RHS) of each dependency
+    fds1 = []
+    for fd in fds:
+        lhs, rhs = fd
+        for rhs_attribute in rhs:
+            fds1.append([lhs, [rhs_attribute]])
+    if verbose: print(f"After minimize RHS: \n{fds1}")
+
+    # Step 2: Minimize the left-hand side (LHS) of each dependency
+    fds2 = reduce_lhs(all_attributes, fds1, lhs_reduction)
+    if verbose: print(f"After minimize LHS: \n{fds2}")
 
     # Step 3: Check if each fd is redundant. i.e. fd can be derived from other fds
     # if you want to find the last solution, uncomment below
@@ -168,41 +285,109 @@ def min_cover(all_attributes, fds):
             min_cover.append(fd)
     # if you want to find the last solution, uncomment below
     min_cover = min_cover[::-1]
-    print(f"After remove redundant: \n{min_cover}")
+    if verbose: print(f"After remove redundant: \n{min_cover}")
     return min_cover
 
 
-def generate_all_min_covers(fds: list[list]) -> list[list]:
+def is_redundant_at(fds, all_attributes, removed, index):
     """
-    To minimize fds itself (remove redundant in all possible ways)
-    :param fds:
-    :return:
+    Check if fds[index] can be derived from the other fds not removed
     """
-    all_min_covers = []
+    other_fds = [fd for i, fd in enumerate(fds) if i != index and not removed[i]]
+    fd_index = closure_cache.get_index(other_fds, all_attributes)
+    X, Y = fds[index]
+    return fd_index.to_bitmask(Y) & ~closure_cache.closure_bits(fd_index, fd_index.to_bitmask(X)) == 0
 
-    def backtrack(cur_min_cover, remaining_fds, index):
-        if index == len(remaining_fds):
-            # remaining fds cannot contain redundant
-            no_redundant_fd = True
-            for fd in remaining_fds:
-                if is_redundant(fd, remaining_fds):
-                    no_redundant_fd = False
-                    break
-            if no_redundant_fd: all_min_covers.append(cur_min_cover)
+
+def iter_min_covers_from(fds, index, removed, kept_redundant, seen=None):
+    """
+    Continue the iter_min_covers search at fds[index]
+    :param removed: flag of each fd, only the flags before index are decided
+    :param kept_redundant: fds before index kept while redundant
+    :param seen: signatures of covers already yielded
+    """
+    all_attributes = get_all_attributes(fds)
+    removed = list(removed)
+    seen = set() if seen is None else seen
+
+    def backtrack(index, kept_redundant):
+        if index == len(fds):
+            # removing fds never makes a kept fd redundant, so only fds kept while redundant are checked again
+            if any(is_redundant_at(fds, all_attributes, removed, i) for i in kept_redundant):
+                return
+            cover = [fd for fd, is_removed in zip(fds, removed) if not is_removed]
+            # duplicate fds give the same cover through different branches
+            signature = get_cover_signature(cover)
+            if signature not in seen:
+                seen.add(signature)
+                yield cover
             return
 
-        cur_fd = remaining_fds[index]
-        if is_redundant(cur_fd, remaining_fds):
-            # don't select cur_min_cover
-            backtrack(cur_min_cover, remaining_fds[:index] + remaining_fds[index + 1:], index)
-        # select cur_min_cover
-        backtrack(cur_min_cover + [cur_fd], remaining_fds, index + 1)
+        if is_redundant_at(fds, all_attributes, removed, index):
+            # don't select cur fd
+            removed[index] = True
+            yield from backtrack(index + 1, kept_redundant)
+            removed[index] = False
+            # select cur fd, it must stop being redundant later
+            yield from backtrack(index + 1, kept_redundant + [index])
+        else:
+            yield from backtrack(index + 1, kept_redundant)
 
-    backtrack([], fds, 0)
-    return all_min_covers
+    yield from backtrack(index, list(kept_redundant))
+
+
+def iter_min_covers(fds: list[list]):
+    """
+    Yield each way to minimize fds itself (remove redundant in all possible ways) as soon as it is found,
+    so islice(iter_min_covers(fds), k) only pays for the first k covers
+    """
+    yield from iter_min_covers_from(fds, 0, [False] * len(fds), [])
+
+
+def split_min_cover_search(fds, depth):
+    """
+    Decide the first depth fds as iter_min_covers does, to run the subtrees separately
+    :return: (removed flags, kept_redundant) of each open branch, in search order
+    """
+    all_attributes = get_all_attributes(fds)
+    depth = min(depth, len(fds))
+    removed = [False] * len(fds)
+    branches = []
+
+    def expand(index, kept_redundant):
+        if index == depth:
+            branches.append((removed.copy(), kept_redundant))
+            return
+        if is_redundant_at(fds, all_attributes, removed, index):
+            removed[index] = True
+            expand(index + 1, kept_redundant)
+            removed[index] = False
+            expand(index + 1, kept_redundant + [index])
+        else:
+            expand(index + 1, kept_redundant)
+
+    expand(0, [])
+    return branches
 
 
-def min_covers(fds):
+def get_cover_signature(cover) -> frozenset:
+    return frozenset((tuple(lhs), tuple(rhs)) for lhs, rhs in cover)
+
+
+def generate_all_min_covers(fds: list[list]) -> list[list]:
+    """
+    To minimize fds itself (remove redundant in all possible ways)
+    :param fds:
+    :return:
+    """
+    return list(iter_min_covers(fds))
+
+
+def min_covers(fds, lhs_reduction="lattice"):
+    """
+    Compute all minimal covers of fds
+    :param lhs_reduction: "lattice" or "greedy", see reduce_lhs
+    """
     print(f"Original dependencies: \n{fds}")
 
     # Step 1: Decompose the right-hand side (RHS) of each dependency
@@ -214,27 +399,7 @@ def min_covers(fds):
     print(f"After minimize RHS: \n{fds1}")
 
     # Step 2: Minimize the left-hand side (LHS) of each dependency
-    # Calculate attribute closure
-    _, attribute_closures = cal_combination_attribute_closure(fds1)
-    fds2 = []
-    for fd in fds1:
-        lhs, rhs = fd
-        # remove trivial dependency, e.g. A,B->A
-        if set(rhs).issubset(set(lhs)):
-            continue
-        # lhs is already minimized
-        if len(lhs) == 1:
-            fds2.append(fd)
-        # lhs is not minimized
-        else:
-            # find first attribute closure which contains rhs
-            for attributes_set, closure in attribute_closures.items():
-                # e.g. 'F' should not be in attributes_set, this is trivial
-                if set(rhs).issubset(closure) and (not set(rhs).issubset(attributes_set)):
-                    fds2.append([sorted(list(attributes_set)), rhs])
-                    break
-    # remove duplicate fd
-    fds2 = remove_duplicate_fds(fds2)
+    fds2 = reduce_lhs(get_all_attributes(fds1), fds1, lhs_reduction)
     print(f"After minimize LHS: \n{fds2}")
 
     # Step 3: Check if fd is redundant. i.e. can be derived from other fds
@@ -275,11 +440,64 @@ def generate_all_reachable_pairs(fds):
     return reachable_pairs
 
 
+def iter_implied_fds(fds, all_attributes=None):
+    """
+    Yield every non-trivial lhs-reduced fd implied by fds, e.g. [['A', 'B'], ['C']], smallest lhs first.
+    A reduced lhs is a free set (no attribute in the closure of the others) and subsets of free sets are free,
+    so lhs candidates grow one attribute at a time from the free sets of the previous level only
+    """
+    if all_attributes is None:
+        all_attributes = get_all_attributes(fds)
+    fd_index = closure_cache.get_index(fds, all_attributes)
+    # an attribute on no lhs only determines itself
+    lhs_only, _, both, _ = classify_attributes(all_attributes, fds)
+    lhs_bits = sorted(fd_index.to_bitmask([attribute]) for attribute in lhs_only + both)
+    # free lhs mask -> its closure mask
+    level = {0: closure_cache.closure_bits(fd_index, 0)}
+    # e.g. {}->A
+    for position in FDIndex.iter_positions(level[0]):
+        yield [[], sorted(fd_index.from_bitmask(1 << position))]
+    while level:
+        next_level = {}
+        for mask, closure in level.items():
+            for bit in lhs_bits:
+                # only add attributes after the last one in mask, each candidate is built once
+                if bit <= mask or bit & closure:
+                    continue
+                candidate = mask | bit
+                subsets_closure = 0
+                is_free = True
+                for position in FDIndex.iter_positions(candidate):
+                    subset = candidate & ~(1 << position)
+                    # every subset is free and does not determine the dropped attribute
+                    if subset not in level or level[subset] & (1 << position):
+                        is_free = False
+                        break
+                    subsets_closure |= level[subset]
+                if not is_free:
+                    continue
+                candidate_closure = closure_cache.closure_bits(fd_index, candidate)
+                next_level[candidate] = candidate_closure
+                # attributes determined by the whole lhs but by no smaller part of it
+                lhs = sorted(fd_index.from_bitmask(candidate))
+                for position in FDIndex.iter_positions(candidate_closure & ~subsets_closure & ~candidate):
+                    yield [lhs, sorted(fd_index.from_bitmask(1 << position))]
+        level = next_level
+
+
+def iter_all_min_covers(fds):
+    """
+    Streaming all_min_covers without printing
+    """
+    yield from iter_min_covers(list(iter_implied_fds(fds)))
+
+
 def all_min_covers(fds):
-    # graph dfs, start from A, can reach B,C; start from B, can reach A,C; start from C, can reach A,B
-    # we have [[['A'],['B']], [['A'],['C']], [['B'],['C']], [['B'],['A']], [['C'],['A']], [['C'],['B']]]
+    # all implied fds, e.g. from A->B, B->C, C->A we have
+    # [[['A'],['B']], [['A'],['C']], [['B'],['A']], [['B'],['C']], [['C'],['A']], [['C'],['B']]]
+    # and composite lhs like A,B->C when neither A nor B alone determines C
     # generate its min covers
-    fds1 = generate_all_reachable_pairs(fds)
+    fds1 = list(iter_implied_fds(fds))
     all_min_covers = min_covers(fds1)
     return all_min_covers
 
@@ -289,14 +507,19 @@ def is_fds_in_BCNF(fds, superkeys):
     Input is minimal cover (compact minimal cover also can)
     Condition: trivial or lhs is superkey
     :param fds:
+    :param superkeys: candidate keys, lhs containing any of them is a superkey
     :return: bool
     """
     print(f"\nChecking R with fds {fds} is in BCNF...")
+    attribute_bits = get_attribute_bits([attribute for superkey in superkeys for attribute in superkey] +
+                                        get_all_attributes(fds))
+    superkey_masks = [to_bitmask(superkey, attribute_bits) for superkey in superkeys]
     in_BCNF = True
     first_violate_fd = None
     for fd in fds:
         lhs, rhs = fd
-        if tuple(lhs) in superkeys:
+        lhs_mask = to_bitmask(lhs, attribute_bits)
+        if any(superkey_mask & ~lhs_mask == 0 for superkey_mask in superkey_masks):
             print(f"Checking {fd}, lhs is a superkey! It is in BCNF.")
         else:
             in_BCNF = False
@@ -318,12 +541,16 @@ def is_fds_in_3NF(fds, superkeys):
     for superkey in superkeys:
         prime_attributes.update(superkey)
     print(f"Prime attributes: {prime_attributes}")
+    attribute_bits = get_attribute_bits(list(prime_attributes) + get_all_attributes(fds))
+    prime_mask = to_bitmask(prime_attributes, attribute_bits)
+    superkey_masks = [to_bitmask(superkey, attribute_bits) for superkey in superkeys]
     in_3NF = True
     for fd in fds:
         lhs, rhs = fd
-        if tuple(lhs) in superkeys:
+        lhs_mask = to_bitmask(lhs, attribute_bits)
+        if any(superkey_mask & ~lhs_mask == 0 for superkey_mask in superkey_masks):
             print(f"Checking {fd}, lhs is a superkey, it is in 3NF.")
-        elif all(element in prime_attributes for element in rhs):
+        elif to_bitmask(rhs, attribute_bits) & ~prime_mask == 0:
             print(f"Checking {fd}, rhs are prime attributes, it is in 3NF.")
         else:
             in_3NF = False
@@ -344,12 +571,17 @@ def is_fds_in_2NF(fds, superkeys):
     for superkey in superkeys:
         prime_attributes.update(superkey)
     print(f"Prime attributes: {prime_attributes}")
+    attribute_bits = get_attribute_bits(list(prime_attributes) + get_all_attributes(fds))
+    prime_mask = to_bitmask(prime_attributes, attribute_bits)
+    superkey_masks = [to_bitmask(superkey, attribute_bits) for superkey in superkeys]
     in_2NF = True
     for fd in fds:
         lhs, rhs = fd
-        if all(element in prime_attributes for element in rhs):
+        lhs_mask = to_bitmask(lhs, attribute_bits)
+        if to_bitmask(rhs, attribute_bits) & ~prime_mask == 0:
             print(f"Checking {fd}, rhs are prime attributes, it is in 2NF.")
-        elif not any(set(lhs).issubset(set(superkey)) and set(lhs) != set(superkey) for superkey in superkeys):
+        # lhs is a proper subset of superkey
+        elif not any(lhs_mask & ~superkey_mask == 0 and lhs_mask != superkey_mask for superkey_mask in superkey_masks):
             print(f"Checking {fd}, lhs is not proper subset of any candidate key, it is in 2NF.")
         else:
             in_2NF = False
@@ -411,7 +643,7 @@ def decompose_to_3NF_synthesis_algo(fds):
 
 
 def decompose_to_BCNF_recursive(R, F):
-    superkeys, combs = cal_combination_attribute_closure(R, F)
+    superkeys = find_candidate_keys(R, F)
     in_BCNF, violate_fd = is_fds_in_BCNF(F, superkeys)
     if in_BCNF:
         return [R], [F]
@@ -420,8 +652,9 @@ def decompose_to_BCNF_recursive(R, F):
     print(f"\nDecomposing R {R} on violated fd {violate_fd}")
     attributes = R
     lhs, rhs = violate_fd
-    R1 = sorted((set(attributes) - set(combs[tuple(lhs)])).union(set(lhs)))
-    R2 = sorted(set(combs[tuple(lhs)]))
+    lhs_closure = cal_attribute_closure(set(lhs), F)
+    R1 = sorted((set(attributes) - lhs_closure).union(set(lhs)))
+    R2 = sorted(lhs_closure)
     F1 = []
     F2 = []
     for fd in F:
@@ -442,32 +675,34 @@ def decompose_to_BCNF_recursive(R, F):
     return Rs, Fs
 
 
-fds = [[['A','B'], ['B','C']], [['C'], ['A','C']], [['B','C','D'],['A','B','D','E']], [['C','D'],['D','E']], [['E'],['D','E']], [['A','B','E'],['C','D','E']]]
-# fds = [[['A','B'], ['C']], [['C'], ['A']]]
-
-# fds = [[['A','B'], ['C','D','E']], [['A','C'], ['B','D','E']], [['B'],['C']], [['C'],['B']], [['C'],['D']], [['B'],['E']], [['C'],['E']]]
-# fds = [[['B'], ['C']], [['C'], ['B','D','E']]]
-# fds = [[['A'], ['B','C','D','E']], [['D'], ['E']]]
-# fds = [[['A','B','C'], ['B','D','E']], [['A','B','C'], ['A','C','G','H']], [['B'],['B','D','E']], [['G'],['B','D','E']]]
-# fds = [[['A', 'B'], ['C']], [['C'], ['B']]]
-all_attributes = get_all_attributes(fds)
-superkeys, combs = cal_combination_attribute_closure(all_attributes, fds)
-print("Superkeys: ", superkeys)
-print("Closures: ", combs)
-min_cov = min_cover(all_attributes, fds)
-print("Min cover: ", min_cov)
-compact_min_cov = get_compact_min_cover(min_cov)
-print("Compact min cover: ", compact_min_cov)
-
-Rs, Fs = decompose_to_BCNF_recursive(all_attributes, compact_min_cov)
-print(f"\nRelation {all_attributes} with F {compact_min_cov} can be decomposed to: ")
-if len(Rs) > 1:
-    for i, R in enumerate(Rs):
-        print(f"R{i+1}: {R}, F{i+1}: {Fs[i]}")
-
-in_3NF = is_fds_in_3NF(compact_min_cov, superkeys)
-if not in_3NF:
-    decompose_to_3NF_synthesis_algo(compact_min_cov)
-
-in_2NF = is_fds_in_2NF(compact_min_cov, superkeys)
-
+if __name__ == "__main__":
+    fds = [[['A','B'], ['B','C']], [['C'], ['A','C']], [['B','C','D'],['A','B','D','E']], [['C','D'],['D','E']], [['E'],['D','E']], [['A','B','E'],['C','D','E']]]
+    # fds = [[['A','B'], ['C']], [['C'], ['A']]]
+
+    # fds = [[['A','B'], ['C','D','E']], [['A','C'], ['B','D','E']], [['B'],['C']], [['C'],['B']], [['C'],['D']], [['B'],['E']], [['C'],['E']]]
+    # fds = [[['B'], ['C']], [['C'], ['B','D','E']]]
+    # fds = [[['A'], ['B','C','D','E']], [['D'], ['E']]]
+    # fds = [[['A','B','C'], ['B','D','E']], [['A','B','C'], ['A','C','G','H']], [['B'],['B','D','E']], [['G'],['B','D','E']]]
+    # fds = [[['A', 'B'], ['C']], [['C'], ['B']]]
+    all_attributes = get_all_attributes(fds)
+    lhs_only, rhs_only, both, neither = classify_attributes(all_attributes, fds)
+    print(f"In every key: {lhs_only + neither}, in no key: {rhs_only}, maybe in a key: {both}")
+    superkeys = find_candidate_keys(all_attributes, fds)
+    print("Superkeys: ", superkeys)
+    print("Closures: ", {key: cal_attribute_closure(set(key), fds) for key in superkeys})
+    min_cov = min_cover(all_attributes, fds)
+    print("Min cover: ", min_cov)
+    compact_min_cov = get_compact_min_cover(min_cov)
+    print("Compact min cover: ", compact_min_cov)
+
+    Rs, Fs = decompose_to_BCNF_recursive(all_attributes, compact_min_cov)
+    print(f"\nRelation {all_attributes} with F {compact_min_cov} can be decomposed to: ")
+    if len(Rs) > 1:
+        for i, R in enumerate(Rs):
+            print(f"R{i+1}: {R}, F{i+1}: {Fs[i]}")
+
+    in_3NF = is_fds_in_3NF(compact_min_cov, superkeys)
+    if not in_3NF:
+        decompose_to_3NF_synthesis_algo(compact_min_cov)
+
+    in_2NF = is_fds_in_2NF(compact_min_cov, superkeys)
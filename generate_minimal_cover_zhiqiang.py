@@ -1,4 +1,7 @@
-from common import count_attributes, get_all_subsets, get_key_string, is_parent_subset
+from common import count_attributes, get_key_string
+from fd_closure import LRUCache, closure_cache
+
+RECORD_CLOSURE_SIZE = 65536
 
 
 def input_dependencies() -> list[str]:
@@ -12,23 +15,19 @@ def input_dependencies() -> list[str]:
         result.append([lhs_attrs, rhs_attrs])
     return result
 
-def gen_min_covers(fds):
+def gen_candidate_fds(fds):
+    """
+    Single rhs fds with candidate key lhs, every minimal cover is a subset of them
+    :return: candidate fds, number of attributes
+    """
     def closure(left_key, dependencies,use_record=True):
-        # eg. left_key {A,B,E}
-        closure_set = set(left_key)
+        # eg. left_key {A,B,E}, dependencies is a FDIndex
         left_key_str = get_key_string(left_key)
-        if (use_record & (left_key_str in record_closure)): return left_key,record_closure.get(left_key_str)
-        # Loop through fds until no changes in closure_set, to ensure that closure_set is complete
-        changed = True
-        while changed:
-            changed = False
-            for fd in dependencies:
-                # eg. left {A,B,E}, right {F} closure_set {A,B,E}
-                left, right = set(fd[0]), set(fd[1])
-                # left ⊆ closure_set && right ⊈ closure_set, add right to closure
-                if left.issubset(closure_set) and not right.issubset(closure_set):
-                    closure_set.update(right)
-                    changed = True
+        if use_record:
+            recorded_closure = record_closure.get(left_key_str)
+            if recorded_closure is not None: return left_key,recorded_closure
+        # linear time closure with fd counters, see fd_closure.FDIndex, memoized across fd sets
+        closure_set = closure_cache.closure(dependencies, left_key)
         
         if len(closure_set) == max_attrs:
             if len(left_key) == 1: return left_key,closure_set # but if left_key only contains one attribute, it must be candidate key
@@ -43,12 +42,14 @@ def gen_min_covers(fds):
         left_key_str = get_key_string(left_key)
         
         if (use_record & (left_key_str not in record_closure)): 
-            record_closure[left_key_str] = closure_set
+            record_closure.put(left_key_str, closure_set)
         return left_key,closure_set
     
     minimal_cover = []
     max_attrs = count_attributes(fds)
-    record_closure = {}
+    # bounded, least recently used keys are dropped first
+    record_closure = LRUCache(RECORD_CLOSURE_SIZE)
+    fds_index = closure_cache.get_index(fds)
     # Remove extraneous attributes from the right-hand side of each FD
     for fd in fds:
         # the left-hand side and right-hand side of a functional dependency
@@ -57,36 +58,114 @@ def gen_min_covers(fds):
             # if right contains multi attributes, we should break it down to single
             # eg. A->B,C -break down-> A->B, A->C
             if attr in left: continue #eg. left {A}, attr A, but {A} -> {A} is meaningless
-            closure_left,closure_right = closure(left, fds,True)
+            closure_left,closure_right = closure(left, fds_index,True)
             if closure_right.issuperset(attr):
                 cover = [list(closure_left), list(attr)]
                 if cover not in minimal_cover: minimal_cover.append(cover)
 
+    return minimal_cover, max_attrs
+
+
+def is_sub_cover(candidate_fds, mask, max_attrs):
+    """
+    Check whether the candidate fds picked by mask still mention every attribute and deduce all candidate fds
+    """
+    subset = [fd for i, fd in enumerate(candidate_fds) if mask >> i & 1]
+    if count_attributes(subset) != max_attrs:
+        return False
+    subset_index = closure_cache.get_index(subset)
+    # eg. subset [B->A,A->C], candidate fds [A->B,B->A,A->C,B->C], check A->B and B->C
+    return all(closure_cache.closure(subset_index, set(left)).issuperset(set(right))
+               for i, (left, right) in enumerate(candidate_fds) if not mask >> i & 1)
+
+
+def iter_min_sub_covers_from(candidate_fds, max_attrs, index, mask, kept_mask=0, kept_droppable=(), found_masks=None):
+    """
+    Continue the iter_min_sub_covers search at candidate_fds[index]
+    :param mask: candidate fds not dropped, only the bits before index are decided
+    :param kept_mask: fds before index decided to keep
+    :param kept_droppable: fds before index kept although they could be dropped
+    :param found_masks: covers found so far, branches containing one of them are skipped
+    """
+    found_masks = [] if found_masks is None else found_masks
+
+    def search(index, mask, kept_mask, kept_droppable):
+        if any(found_mask & ~kept_mask == 0 for found_mask in found_masks):
+            return
+        if index == len(candidate_fds):
+            # fds kept because dropping them broke a larger cover are needed here too
+            if any(is_sub_cover(candidate_fds, mask & ~(1 << i), max_attrs) for i in kept_droppable):
+                return
+            found_masks.append(mask)
+            yield [fd for i, fd in enumerate(candidate_fds) if mask >> i & 1]
+            return
+        bit = 1 << index
+        droppable = is_sub_cover(candidate_fds, mask & ~bit, max_attrs)
+        if droppable:
+            yield from search(index + 1, mask & ~bit, kept_mask, kept_droppable)
+        yield from search(index + 1, mask, kept_mask | bit, kept_droppable + [index] if droppable else kept_droppable)
+
+    yield from search(index, mask, kept_mask, list(kept_droppable))
+
+
+def iter_min_sub_covers(candidate_fds, max_attrs):
+    """
+    Yield each inclusion-minimal subset of candidate_fds that is still a cover, as soon as it is found.
+    Dropping fds only loses covers, so a branch stops as soon as one drop breaks the cover,
+    and a branch whose kept fds already contain a found cover cannot give a minimal one
+    """
+    full_mask = (1 << len(candidate_fds)) - 1
+    if is_sub_cover(candidate_fds, full_mask, max_attrs):
+        yield from iter_min_sub_covers_from(candidate_fds, max_attrs, 0, full_mask)
+
+
+def split_sub_cover_search(candidate_fds, max_attrs, depth):
+    """
+    Decide the first depth candidate fds as iter_min_sub_covers does, to run the subtrees separately
+    :return: (mask, kept_mask, kept_droppable) of each open branch, in search order
+    """
+    depth = min(depth, len(candidate_fds))
+    branches = []
+
+    def expand(index, mask, kept_mask, kept_droppable):
+        if index == depth:
+            branches.append((mask, kept_mask, kept_droppable))
+            return
+        bit = 1 << index
+        droppable = is_sub_cover(candidate_fds, mask & ~bit, max_attrs)
+        if droppable:
+            expand(index + 1, mask & ~bit, kept_mask, kept_droppable)
+        expand(index + 1, mask, kept_mask | bit, kept_droppable + [index] if droppable else kept_droppable)
+
+    full_mask = (1 << len(candidate_fds)) - 1
+    if is_sub_cover(candidate_fds, full_mask, max_attrs):
+        expand(0, full_mask, 0, [])
+    return branches
+
+
+def sort_in_subset_order(covers, candidate_fds):
+    """
+    Same order as enumerating subsets with the first candidate fd as the highest bit
+    """
+    def subset_order(cover):
+        return sum(1 << (len(candidate_fds) - 1 - candidate_fds.index(fd)) for fd in cover)
+    return sorted(covers, key=subset_order)
+
+
+def iter_gen_min_covers(fds):
+    """
+    Streaming gen_min_covers, covers come in search order
+    """
+    minimal_cover, max_attrs = gen_candidate_fds(fds)
+    yield from iter_min_sub_covers(minimal_cover, max_attrs)
+
+
+def gen_min_covers(fds):
+    minimal_cover, max_attrs = gen_candidate_fds(fds)
     # Remove redundant functional dependencies
     # eg. remove A->C, since A->B, B->C exist
-    def check_cover(dfs,subset):
-        '''
-        Check whether the complete dfs can be deduced from subset
-        '''
-        # eg. subset [B->A,A->C], dfs [A->B,B->A,A->C,B->C], absent_subset [A->B,B->C]
-        absent_subset = [df for df in dfs if df not in subset]
-        for validation_df in absent_subset:
-            # eg. validate_df {A}->{B}
-            left,right = validation_df[0],validation_df[1]
-            _,closure_set = closure(set(left),subset,False)
-            if not closure_set.issuperset(set(right)):
-                # subset cannot deduce the complete dfs,since dependency validation_df cannot be deduced based on subsest
-                return False
-        return True
-
-    all_subsets = list(get_all_subsets(minimal_cover,[],0,max_attrs))
-    all_minimal_cover = []
-    for subset in all_subsets:
-        if check_cover(minimal_cover,subset): 
-            if not any(is_parent_subset(subset, existing_cover) for existing_cover in all_minimal_cover):
-                # if existing_cover [A->B,B->A,B->C] is a minimal cover, the subset [A->B,B->A,B->C,A->C] is redundant
-                all_minimal_cover.append(subset)
-    return all_minimal_cover
+    all_minimal_cover = list(iter_min_sub_covers(minimal_cover, max_attrs))
+    return sort_in_subset_order(all_minimal_cover, minimal_cover)
 
 
 # example1: A->B;B->C;B->A;A->C
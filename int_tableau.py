@@ -0,0 +1,114 @@
+"""
+Integer encoded tableau for the chase with distinguished variables.
+Each cell is a small int, 0 is the distinguished variable α and k > 0 is the subscript,
+e.g. column A value 2 is printed as 'a2'.
+"""
+
+import numpy as np
+import pandas as pd
+
+DISTINGUISHED = 0
+
+
+class IntTableau:
+    def __init__(self, attributes: list, num_rows: int):
+        """
+        Row i starts with subscript i + 1 in every column, e.g. a1 b1 c1 / a2 b2 c2
+        """
+        self.attributes = list(attributes)
+        self.column_index = {attribute: i for i, attribute in enumerate(self.attributes)}
+        self.data = np.repeat(np.arange(1, num_rows + 1, dtype=np.int64)[:, None], len(self.attributes), axis=1)
+        # total number of cells changed by apply_fd, read by the instrumentation
+        self.cells_equated = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def columns(self, attributes) -> list[int]:
+        return [self.column_index[attribute] for attribute in attributes]
+
+    def distinguish(self, row: int, attributes) -> None:
+        self.data[row, self.columns(attributes)] = DISTINGUISHED
+
+    def group_by(self, xs) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Group rows with same xs values
+        :return: group id of each row, size of each group
+        """
+        _, inverse, counts = np.unique(self.data[:, self.columns(xs)], axis=0, return_inverse=True,
+                                       return_counts=True)
+        return inverse.reshape(-1), counts
+
+    def apply_fd(self, xs, ys) -> list[str]:
+        """
+        Rows with same xs take the minimum of each ys column within the group,
+        so α (0) wins, otherwise the smallest subscript wins
+        :return: ys columns whose values changed, empty if nothing changed
+        """
+        inverse, counts = self.group_by(xs)
+        if not (counts > 1).any():
+            return []
+        changed_columns = []
+        for y, col in zip(ys, self.columns(ys)):
+            group_min = np.full(len(counts), np.iinfo(self.data.dtype).max, dtype=self.data.dtype)
+            np.minimum.at(group_min, inverse, self.data[:, col])
+            new_values = group_min[inverse]
+            num_changed = int(np.count_nonzero(new_values != self.data[:, col]))
+            if num_changed:
+                self.cells_equated += num_changed
+                self.data[:, col] = new_values
+                changed_columns.append(y)
+        return changed_columns
+
+    def apply_mvd(self, xs, ys, restricted: bool = False) -> list[str]:
+        """
+        For each pair of rows with same xs, append the two rows with their ys swapped
+        :param restricted: only append swapped rows not already in the tableau, each distinct row once,
+                           otherwise every swapped row is appended, duplicates included, as long as one is new
+        :return: all columns if any appended row is new, empty if nothing changed, then nothing is appended
+        """
+        inverse, counts = self.group_by(xs)
+        if not (counts > 1).any():
+            return []
+        y_cols = self.columns(ys)
+        # rows sorted by group, each group is a contiguous slice
+        order = np.argsort(inverse, kind="stable")
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        new_rows = []
+        for start, count in zip(starts, counts):
+            if count < 2:
+                continue
+            rows = order[start:start + count]
+            i, j = np.triu_indices(count, k=1)
+            first, second = self.data[rows[i]], self.data[rows[j]]
+            first[:, y_cols], second[:, y_cols] = self.data[rows[j]][:, y_cols], self.data[rows[i]][:, y_cols]
+            # keep each swapped pair next to each other
+            new_rows.append(np.stack([first, second], axis=1).reshape(-1, len(self.attributes)))
+        existing_rows = set(map(tuple, self.data.tolist()))
+        new_data = np.vstack(new_rows)
+        if restricted:
+            # dict keeps the first occurrence order of distinct rows
+            missing_rows = [row for row in dict.fromkeys(map(tuple, new_data.tolist())) if row not in existing_rows]
+            if not missing_rows:
+                return []
+            self.data = np.vstack([self.data, np.array(missing_rows, dtype=self.data.dtype)])
+            return list(self.attributes)
+        # no new tuple, appending the copies would only grow the tableau each time the mvd is tried again
+        if all(row in existing_rows for row in map(tuple, new_data.tolist())):
+            return []
+        self.data = np.vstack([self.data, new_data])
+        return list(self.attributes)
+
+    def has_distinguished_row(self) -> bool:
+        return bool((self.data == DISTINGUISHED).all(axis=1).any())
+
+    def are_columns_distinguished(self, attributes) -> bool:
+        return bool((self.data[:, self.columns(attributes)] == DISTINGUISHED).all())
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Decode to the string tableau used for printing, e.g. 0 -> 'α', 2 -> 'a2'
+        """
+        data = [[f"{attribute.lower()}{value}" if value != DISTINGUISHED else 'α'
+                 for attribute, value in zip(self.attributes, row)] for row in self.data.tolist()]
+        return pd.DataFrame(data, columns=self.attributes)
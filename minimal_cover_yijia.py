@@ -6,6 +6,8 @@
 import pandas as pd
 from common import print_df_pretty
 from itertools import combinations
+from fd_closure import FDIndex
+from tableau_index import TableauIndex
 
 
 def generate_initial_state(attributes):
@@ -24,57 +26,60 @@ def generate_initial_state(attributes):
     return table
 
 
-def apply_dependency(d, table) -> bool:
+def apply_dependency(d, table, table_index=None) -> tuple[bool, pd.DataFrame]:
     """
     Process each d as in current iteration.
     if d is functional dependency, find tuples with same x, make y the same
     if d is multi-value dependency, copy the two rows pairs with same x, swap their y values
     :param d: each dependency
-    :param table: table
-    :return: if successful
+    :param table: table, cells are equated in place, new rows are appended to a new table
+    :param table_index: TableauIndex of table, kept in sync when the same table is chased by many dependencies
+    :return: if successful, table after applying d
     """
+    if table_index is None:
+        table_index = TableauIndex(table)
     # multi-value dependency
     if "->>" in d:
         x, y = d.split("->>")
         xs, ys = x.split(","), y.split(",")
         # find rows with same xs
-        duplicated_rows = table[table.duplicated(subset=xs, keep=False)]
-        if not len(duplicated_rows):
-            return False
-        # group by xs, each group may have more than two rows, swap each pair two rows' ys
-        groups = duplicated_rows.groupby(xs)
-        for _, group_df in groups:
-            group_df.reset_index(drop=True, inplace=True)
-
-            for i in range(len(group_df)):
-                for j in range(i + 1, len(group_df)):
-                    pair = group_df.iloc[[i, j]]
-                    pair.reset_index(drop=True, inplace=True)
+        groups = table_index.matching_groups(xs)
+        if not groups:
+            return False, table
+        # each group may have more than two rows, swap each pair two rows' ys
+        new_rows = []
+        for rows in groups:
+            for i in range(len(rows)):
+                for j in range(i + 1, len(rows)):
+                    row1, row2 = table_index.rows[rows[i]].copy(), table_index.rows[rows[j]].copy()
                     # swap their ys values
-                    pair.loc[0, ys], pair.loc[1, ys] = pair.loc[1, ys], pair.loc[0, ys]
-                    table = pd.concat([table, pair], ignore_index=True)
+                    for col in ys:
+                        position = table_index.column_position[col]
+                        row1[position], row2[position] = row2[position], row1[position]
+                    new_rows += [row1, row2]
+        # append rows to df in one batch
+        for row in new_rows:
+            table_index.append_row(row)
+        table = pd.concat([table, pd.DataFrame(new_rows, columns=table.columns)], ignore_index=True)
     # functional dependency
     else:
         x, y = d.split("->")
         xs, ys = x.split(","), y.split(",")
         # find rows with same xs
-        duplicated_rows = table[table.duplicated(subset=xs, keep=False)]
-        if not len(duplicated_rows):
-            return False
-        # group by xs,
+        groups = table_index.matching_groups(xs)
+        if not groups:
+            return False, table
         # if one row's ys is alpha, make other ys alpha
         # else if one row has small subscript
-        groups = duplicated_rows.groupby(xs)
-        for _, group_df in groups:
-            alpha_exists = 'α' in group_df[ys].values
-            # Update the ys column with 'α'
-            if alpha_exists:
-                table.loc[group_df.index, ys] = 'α'
-            else:
-                min_subscript_value = group_df[ys].min().item()
-                # Update the ys column with the smallest value
-                table.loc[group_df.index, ys] = min_subscript_value
-    return True
+        for rows in groups:
+            values = [table_index.value(row, col) for row in rows for col in ys]
+            value = 'α' if 'α' in values else min(values)
+            # Update the ys column with 'α' or the smallest value
+            for col in ys:
+                changed_rows = table_index.set_value(rows, col, value)
+                if changed_rows:
+                    table.loc[changed_rows, col] = value
+    return True, table
 
 
 def if_found_one_tuple_with_same_value(table):
@@ -119,7 +124,7 @@ def run_chase_algorithm(relation, covers, attributes) -> bool:
     # note: we should consider the sequence of dependencies
 
     # delete one cover a time, if this cover is entailed by the left covers, then the whole one is not minimal cover
-    sigma = convert_to_sigma(relation)
+    sigma = FDIndex(convert_to_sigma(relation))
     for cover in covers:
         table = generate_initial_state(attributes=attributes)
         desired_xys = findxy(cover)
@@ -135,9 +140,10 @@ def run_chase_algorithm(relation, covers, attributes) -> bool:
             if closure_temp == closure_this_cover:
                 return False
         change_initial_tuple(table, cover, desired_xs, desired_ys, attributes)
+        table_index = TableauIndex(table)
         cover_pop_fd = covers_without_fd(covers, cover)
         for fd in cover_pop_fd:
-            result = apply_dependency(fd, table)
+            result, table = apply_dependency(fd, table, table_index)
             # successfully applied this dependency
             if result:
                 print("\nTuples after Applying Dependency:")
@@ -156,10 +162,11 @@ def run_chase_algorithm(relation, covers, attributes) -> bool:
         desired_ys = desired_xys[1].split(",")
 
         change_initial_tuple(table, fd, desired_xs, desired_ys, attributes)
+        table_index = TableauIndex(table)
 
         # start chase
         for cover in covers:
-            result = apply_dependency(cover, table)
+            result, table = apply_dependency(cover, table, table_index)
             # successfully applied this dependency
             if result:
                 print("\nTuples after Applying Dependency:")
@@ -210,16 +217,16 @@ def find_subsets(S):
     return subsets
 
 def find_closure(S, sigma):
+    """
+    Closure of attributes S under sigma
+    :param S: attributes
+    :param sigma: FDIndex of dependencies, or a list of (X, Y) from convert_to_sigma
+    :return: closure set
+    """
+    if not isinstance(sigma, FDIndex):
+        sigma = FDIndex(sigma)
+    return sigma.closure(S)
 
-    unused = sigma.copy()  # Ω stands for 'unused'
-    closure = set(S)  # Γ stands for 'closure'
-
-    while any(X <= closure for X, Y in unused):
-        X, Y = next((X, Y) for X, Y in unused if X <= closure)
-        unused.remove((X, Y))
-        closure.update(Y)
-
-    return closure
 def input_dependencies() -> list[str]:
     dependencies_input = input("Enter functional dependencies separated by ';' (e.g. A->B;B->C)")
     dependencies_list = dependencies_input.split(";")
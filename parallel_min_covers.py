@@ -0,0 +1,118 @@
+"""
+Enumerate all minimal covers on a process pool.
+The search tree is split by the decisions on the first depth fds, each open branch is searched by a worker,
+then the covers are merged in search order and deduplicated, so the output does not depend on scheduling.
+
+Usage:
+python parallel_min_covers.py "A->B;B->C;B->A;A->C" --workers 8 --depth 6
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from generate_minimal_cover_jacob import get_cover_signature, iter_min_covers_from, split_min_cover_search
+from generate_minimal_cover_zhiqiang import gen_candidate_fds, iter_min_sub_covers_from, sort_in_subset_order, \
+    split_sub_cover_search
+
+
+def get_default_depth(workers: int, num_fds: int) -> int:
+    """
+    About 4 branches per worker, so a few slow subtrees don't leave the other workers idle
+    """
+    depth = 0
+    while (1 << depth) < 4 * workers and depth < num_fds:
+        depth += 1
+    return depth
+
+
+def merge_covers(branch_covers) -> list:
+    """
+    Concatenate the covers of each branch in search order, keeping the first of duplicate covers
+    """
+    seen = set()
+    covers = []
+    for branch in branch_covers:
+        for cover in branch:
+            signature = get_cover_signature(cover)
+            if signature not in seen:
+                seen.add(signature)
+                covers.append(cover)
+    return covers
+
+
+def solve_min_cover_branch(args) -> list:
+    fds, depth, removed, kept_redundant = args
+    return list(iter_min_covers_from(fds, depth, removed, kept_redundant))
+
+
+def solve_sub_cover_branch(args) -> list:
+    candidate_fds, max_attrs, depth, mask, kept_mask, kept_droppable = args
+    return list(iter_min_sub_covers_from(candidate_fds, max_attrs, depth, mask, kept_mask, kept_droppable))
+
+
+def parallel_generate_all_min_covers(fds: list[list], workers: int = None, depth: int = None) -> list:
+    """
+    Same covers and order as generate_all_min_covers
+    :param workers: number of processes, default is the number of CPUs
+    :param depth: number of leading fds decided before splitting, default gives about 4 branches per worker
+    """
+    workers = workers or os.cpu_count() or 1
+    depth = get_default_depth(workers, len(fds)) if depth is None else min(depth, len(fds))
+    branches = split_min_cover_search(fds, depth)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map keeps the branch order
+        branch_covers = executor.map(solve_min_cover_branch,
+                                     [(fds, depth, removed, kept_redundant) for removed, kept_redundant in branches])
+        return merge_covers(branch_covers)
+
+
+def parallel_gen_min_covers(fds: list[list], workers: int = None, depth: int = None) -> list:
+    """
+    Same covers and order as gen_min_covers
+    :param workers: number of processes, default is the number of CPUs
+    :param depth: number of leading candidate fds decided before splitting, default gives about 4 branches per worker
+    """
+    workers = workers or os.cpu_count() or 1
+    candidate_fds, max_attrs = gen_candidate_fds(fds)
+    depth = get_default_depth(workers, len(candidate_fds)) if depth is None else min(depth, len(candidate_fds))
+    branches = split_sub_cover_search(candidate_fds, max_attrs, depth)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        branch_covers = executor.map(solve_sub_cover_branch,
+                                     [(candidate_fds, max_attrs, depth, mask, kept_mask, kept_droppable)
+                                      for mask, kept_mask, kept_droppable in branches])
+        # workers don't share found covers, a cover is still minimal only if no single fd can be dropped
+        return sort_in_subset_order(merge_covers(branch_covers), candidate_fds)
+
+
+def parse_fds(text: str) -> list[list]:
+    """
+    'A,B->C;C->A' -> [[['A', 'B'], ['C']], [['C'], ['A']]]
+    """
+    fds = []
+    for dependency in text.split(";"):
+        lhs, rhs = dependency.strip().split("->")
+        fds.append([lhs.split(","), rhs.split(",")])
+    return fds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enumerate all minimal covers on a process pool")
+    parser.add_argument("fds", help="functional dependencies separated by ';', e.g. A->B;B->C;B->A;A->C")
+    parser.add_argument("--method", choices=["jacob", "zhiqiang"], default="zhiqiang",
+                        help="jacob minimizes the fds themselves, zhiqiang starts from candidate key lhs")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--depth", type=int, default=None, help="leading fds decided before splitting")
+    args = parser.parse_args()
+
+    fds = parse_fds(args.fds)
+    if args.method == "jacob":
+        covers = parallel_generate_all_min_covers(fds, args.workers, args.depth)
+    else:
+        covers = parallel_gen_min_covers(fds, args.workers, args.depth)
+    for cover in covers:
+        print(";".join(f"{','.join(lhs)}->{','.join(rhs)}" for lhs, rhs in cover))
+
+
+if __name__ == "__main__":
+    main()
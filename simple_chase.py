@@ -6,20 +6,43 @@ Copyright 2024 Xie Yuan
 """
 
 import pandas as pd
-from common import print_df_pretty
+from common import ChaseResult, print_df_pretty
+from chase_stats import ChaseStats
+from chase_checkpoint import ChaseCheckpointer
+from chase_worklist import ChaseWorklist
+from tableau_index import TableauIndex
 
 
 class SimpleChaseChecker:
-    def __init__(self):
-        self.attributes = self.input_attributes()
-        self.dependencies = self.input_dependencies()
-        self.desired_dependency = self.input_chase_dependency()
+    def __init__(self, restricted: bool = False, attributes: list = None, dependencies: list = None,
+                 desired_dependency: str = None, verbose: bool = True, stats: ChaseStats = None,
+                 checkpoint: ChaseCheckpointer = None):
+        """
+        Problem parts left as None are read with input()
+        :param restricted: restricted chase, a mvd only appends swapped tuples not already in the tableau,
+                           otherwise every swapped copy is appended, duplicates included, as long as one is new
+        :param attributes: e.g. ['A', 'B', 'C', 'D']
+        :param dependencies: e.g. ['A->>B,C', 'D->C']
+        :param desired_dependency: e.g. 'A->C'
+        :param verbose: print every step, set False to run headless
+        :param stats: collector recording every tried dependency, None to skip the instrumentation
+        :param checkpoint: saves the chase every N steps or T seconds and resumes from its file, None to disable
+        """
+        self.restricted = restricted
+        self.verbose = verbose
+        self.stats = stats
+        self.checkpoint = checkpoint
+        self.attributes = self.input_attributes() if attributes is None else list(attributes)
+        self.dependencies = self.input_dependencies() if dependencies is None else list(dependencies)
+        self.desired_dependency = self.input_chase_dependency() if desired_dependency is None else \
+            desired_dependency.strip()
         self.is_desired_dependency_mvd = "->>" in self.desired_dependency
         self.desired_x, self.desired_y = self.desired_dependency.split(
             "->>" if self.is_desired_dependency_mvd else "->")
         self.desired_xs = self.desired_x.split(",")
         self.desired_ys = self.desired_y.split(",")
         self.table = self.generate_initial_state()
+        self.table_index = None
 
     def generate_initial_state(self):
         data = []
@@ -28,80 +51,173 @@ class SimpleChaseChecker:
             data.append(row_values)
         # Create the initial DataFrame
         table = pd.DataFrame(data, columns=self.attributes)
-        print("\nInitial Tuples:")
-        print_df_pretty(table)
+        self.log("\nInitial Tuples:")
+        self.log_table(table)
         return table
 
-    def apply_dependency(self, d: str) -> bool:
+    def apply_dependency(self, d: str) -> list[str]:
         """
         Process each d as in current iteration.
         if d is functional dependency, find two tuple with same x, make y the same
-        if d is multi-value dependency, copy the two rows with same x, swap their y values
+        if d is multi-value dependency, copy each pair of rows with same x, swap their y values
         :param d:
-        :return: modified table
+        :return: changed columns, empty if the table is not changed
         """
         # multi-value dependency
         if "->>" in d:
             # 'A->>B,C'
             x, y = d.split("->>")
             xs, ys = x.split(","), y.split(",")
-            # find rows with same xs
-            duplicated_rows = self.table[self.table.duplicated(subset=xs, keep=False)]
-            if not len(duplicated_rows):
-                return False
-            # group by xs, swap each group two rows' ys
-            groups = duplicated_rows.groupby(xs)
-            for _, group_df in groups:
-                group_df.reset_index(drop=True, inplace=True)
-                # swap their ys values
-                group_df.loc[0, ys], group_df.loc[1, ys] = group_df.loc[1, ys], group_df.loc[0, ys]
-                # append two rows to df
-                self.table = pd.concat([self.table, group_df], ignore_index=True)
+            # find rows with same xs from the index
+            table_index = self.get_table_index()
+            groups = table_index.matching_groups(xs)
+            self.count(rows_scanned=sum(len(rows) for rows in groups))
+            if not groups:
+                return []
+            new_rows = []
+            # each group may have more than two rows, swap each pair two rows' ys
+            for rows in groups:
+                for i in range(len(rows)):
+                    for j in range(i + 1, len(rows)):
+                        row1, row2 = table_index.rows[rows[i]].copy(), table_index.rows[rows[j]].copy()
+                        # swap their ys values
+                        for col in ys:
+                            position = table_index.column_position[col]
+                            row1[position], row2[position] = row2[position], row1[position]
+                        new_rows += [row1, row2]
+            if self.restricted:
+                new_rows = table_index.missing_rows(new_rows)
+                if not new_rows:
+                    return []
+            # no new tuple, appending the copies would only grow the tableau each time the mvd is tried again
+            if not any(not table_index.contains(row) for row in new_rows):
+                return []
+            # unrestricted chase keeps the copies already in the tableau, the baseline the restricted chase is
+            # measured against
+            # append rows to df in one batch
+            for row in new_rows:
+                table_index.append_row(row)
+            self.count(rows_appended=len(new_rows))
+            self.table = pd.concat([self.table, pd.DataFrame(new_rows, columns=self.attributes)], ignore_index=True)
+            # new rows may match any dependency
+            return list(self.attributes)
         # functional dependency
         else:
             # 'D->C'
             x, y = d.split("->")
             xs, ys = x.split(","), y.split(",")
-            # find rows with same xs
-            duplicated_rows = self.table[self.table.duplicated(subset=xs, keep=False)]
-            if not len(duplicated_rows):
-                return False
-            # group by xs, make their ys as the smaller subscript
-            groups = duplicated_rows.groupby(xs)
-            for _, group_df in groups:
-                min_subscript_value = group_df[ys].min().item()  # Get the smallest 'C' value within the group
-                # Update the ys column with the smallest value
-                self.table.loc[group_df.index, ys] = min_subscript_value
+            # find rows with same xs from the index
+            table_index = self.get_table_index()
+            groups = table_index.matching_groups(xs)
+            self.count(rows_scanned=sum(len(rows) for rows in groups))
+            if not groups:
+                return []
+            changed_columns = []
+            # make each group's ys as the smaller subscript
+            for rows in groups:
+                for col in ys:
+                    # Get the smallest 'C' value within the group
+                    min_subscript_value = min(table_index.value(row, col) for row in rows)
+                    changed_rows = table_index.set_value(rows, col, min_subscript_value)
+                    if not changed_rows:
+                        continue
+                    self.count(cells_equated=len(changed_rows))
+                    # Update the ys column with the smallest value
+                    self.table.loc[changed_rows, col] = min_subscript_value
+                    if col not in changed_columns:
+                        changed_columns.append(col)
+            return changed_columns
 
-        return True
+    def get_table_index(self) -> TableauIndex:
+        """
+        Hash index on lhs projections of the tableau, built on first probe and kept in sync by apply_dependency
+        """
+        if self.table_index is None:
+            self.table_index = TableauIndex(self.table)
+        return self.table_index
+
+    def log(self, *args) -> None:
+        if self.verbose:
+            print(*args)
+
+    def log_table(self, table) -> None:
+        if self.verbose:
+            print_df_pretty(table)
+
+    def count(self, **counters) -> None:
+        if self.stats is not None:
+            self.stats.count(**counters)
+
+    def try_dependency(self, d: str) -> list[str]:
+        """
+        apply_dependency, recorded as one step if instrumented
+        """
+        if self.stats is None:
+            return self.apply_dependency(d)
+        self.stats.begin_step(d)
+        changed_columns = self.apply_dependency(d)
+        self.stats.end_step(bool(changed_columns), len(self.table))
+        return changed_columns
+
+    def get_problem(self) -> dict:
+        """
+        What a checkpoint is checked against before resuming
+        """
+        return {"checker": "simple", "restricted": self.restricted, "attributes": self.attributes,
+                "dependencies": sorted(self.dependencies), "desired": self.desired_dependency}
+
+    def resume(self) -> tuple[ChaseWorklist, int]:
+        """
+        Worklist and step counter of the latest checkpoint, or of a new chase after preprocessing the tuples
+        """
+        state = self.checkpoint.load(self.get_problem()) if self.checkpoint is not None else None
+        if state is None:
+            # make second row self.desired_x = first row
+            self.log(f"\nDesired X is {self.desired_x}, make their value the same")
+            self.table.loc[1, self.desired_xs] = self.table.loc[0, self.desired_xs]
+            self.log_table(self.table)
+            return ChaseWorklist(self.dependencies), 0
+        self.table = state["table"]
+        # rebuilt from the restored tableau on first probe
+        self.table_index = None
+        self.log(f"\nResume from checkpoint {self.checkpoint.path} after {state['steps']} steps:")
+        self.log_table(self.table)
+        return ChaseWorklist(self.dependencies, state["worklist"]), state["steps"]
+
+    def save_checkpoint(self, worklist: ChaseWorklist, steps: int) -> None:
+        if self.checkpoint is not None and self.checkpoint.due(steps):
+            self.checkpoint.save(self.get_problem(), self.table, worklist.get_pending(), steps)
 
-    def run_simple_chase_algorithm(self) -> None:
-        # make second row self.desired_x = first row
-        print(f"\nDesired X is {self.desired_x}, make their value the same")
-        self.table.loc[1, self.desired_xs] = self.table.loc[0, self.desired_xs]
-        print_df_pretty(self.table)
+    def run_simple_chase_algorithm(self) -> ChaseResult:
+        """
+        Main chase algorithm
+        :return: verdict, number of applied dependencies and final tableau
+        """
         success = False
         # Start iterations
-        while self.dependencies:
-            d = self.dependencies.pop(0)
-            print(f"\nTry to apply the dependency: {d}")
-            result = self.apply_dependency(d)
+        # a dependency is tried again only when a column in its lhs changed, until the worklist is empty
+        worklist, steps = self.resume()
+        while worklist:
+            d = worklist.pop()
+            self.log(f"\nTry to apply the dependency: {d}")
+            changed_columns = self.try_dependency(d)
             # if cannot apply this dependency
-            if not result:
+            if not changed_columns:
                 # it is the last dependency, we fail
-                if not self.dependencies:
-                    print("Cannot apply this dependency. And it is the last dependency, dependency is violated")
+                if not worklist:
+                    self.log("Cannot apply this dependency. And it is the last dependency, dependency is violated")
                 # it is not the last dependency, we apply other first
                 else:
-                    print(
+                    self.log(
                         "Cannot apply this dependency. It is not the last dependency, apply the next dependency first")
-                    # append it to the end for later use
-                    self.dependencies.append(d)
-                    continue
+                self.save_checkpoint(worklist, steps)
+                continue
+            worklist.notify_changed(changed_columns)
+            steps += 1
             # successfully applied this dependency
-            print("Tuples after Applying Functional Dependencies:")
-            print_df_pretty(self.table)
-            print(f"\nChecking if desired dependency {self.desired_dependency} fulfilled...")
+            self.log("Tuples after Applying Functional Dependencies:")
+            self.log_table(self.table)
+            self.log(f"\nChecking if desired dependency {self.desired_dependency} fulfilled...")
 
             # check if desired dependency is fulfilled
             # case1: desired dependency is multi-value
@@ -110,7 +226,7 @@ class SimpleChaseChecker:
             # case2: desired dependency is functional
             else:
                 # check if desired_ys are the same
-                result = (self.table[self.desired_ys].nunique() == 1).item()
+                result = (self.table[self.desired_ys].nunique() == 1).all()
 
             # desired dependency fulfilled
             if result:
@@ -118,13 +234,17 @@ class SimpleChaseChecker:
                 break
 
             # not last dependency, print continue
-            if self.dependencies:
-                print(
+            if worklist:
+                self.log(
                     f"Desired dependency {self.desired_dependency} not fulfilled, continue applying other dependencies")
+            self.save_checkpoint(worklist, steps)
         if success:
-            print(f"Congrats! Valid desired dependency {self.desired_dependency}!")
+            self.log(f"Congrats! Valid desired dependency {self.desired_dependency}!")
         else:
-            print(f"Sorry! Invalid desired dependency {self.desired_dependency}.")
+            self.log(f"Sorry! Invalid desired dependency {self.desired_dependency}.")
+        if self.checkpoint is not None:
+            self.checkpoint.remove()
+        return ChaseResult(success, steps, self.table)
 
     def if_mvd_is_valid(self):
         # iterate each row pair, e.g. 1,2 1,3 1,4 2,3 2,4 ...
@@ -152,7 +272,7 @@ class SimpleChaseChecker:
                         break
                 # after iterate all tuple other than row1, row2, not third tuple is found, means not fulfilled yet, continue next dependency
                 if not exist:
-                    print(f"For (row{i}, row{j}) pair, cannot find the third tuple to fulfill conditions")
+                    self.log(f"For (row{i}, row{j}) pair, cannot find the third tuple to fulfill conditions")
                     return False
         return True
 
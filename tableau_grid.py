@@ -0,0 +1,241 @@
+"""
+Incremental tableau rendering for the GUIs.
+A chase step is yielded as a TableDelta (changed cells and appended rows). TableauRows applies it to
+the rows kept in memory, and TableauGrid draws only the rows visible on a Canvas, so a tableau of tens of
+thousands of rows costs no more canvas items than one screen.
+"""
+
+from tkinter import Canvas, Frame, Scrollbar
+from tkinter import font as tkfont
+
+
+class TableDelta:
+    """
+    Changes of the tableau in one chase step
+    changed_cells: (row, column, value), row is the row index or the decomposition key
+    appended_rows: (row, values) of rows appended at the end, values in column order
+    dependency: the dependency applied in the step
+    """
+
+    def __init__(self, dependency: str = None):
+        self.dependency = dependency
+        self.changed_cells = []
+        self.appended_rows = []
+
+    def __bool__(self):
+        return bool(self.changed_cells or self.appended_rows)
+
+    def __repr__(self):
+        return f"TableDelta(changed_cells={len(self.changed_cells)}, appended_rows={len(self.appended_rows)})"
+
+    def change_cell(self, row, column, value) -> None:
+        self.changed_cells.append((row, column, value))
+
+    def append_row(self, row, values) -> None:
+        self.appended_rows.append((row, list(values)))
+
+    def merge(self, other: "TableDelta") -> None:
+        """
+        Add the changes of a later step, a cell changed twice keeps only its last value
+        """
+        cells = {(row, column): value for row, column, value in self.changed_cells}
+        for row, column, value in other.changed_cells:
+            cells[(row, column)] = value
+        self.changed_cells = [(row, column, value) for (row, column), value in cells.items()]
+        self.appended_rows.extend(other.appended_rows)
+        self.dependency = other.dependency
+
+
+class TableauRows:
+    """
+    Rows of the tableau in display order, patched by each TableDelta
+    The chase mutates its own table on the worker thread, so the grid reads from this copy instead
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.column_position = {column: i for i, column in enumerate(self.columns)}
+        # [row, values] in display order, row is the row index or the decomposition key
+        self.rows = []
+        self.positions = {}
+        # (position, column) changed by the last delta
+        self.highlighted = set()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, position: int) -> tuple:
+        return self.rows[position]
+
+    def append(self, row, values) -> int:
+        self.positions[row] = len(self.rows)
+        self.rows.append((row, list(values)))
+        return len(self.rows) - 1
+
+    def load(self, rows) -> None:
+        self.rows = []
+        self.positions = {}
+        self.highlighted = set()
+        for row, values in rows:
+            self.append(row, values)
+
+    def apply_delta(self, delta: TableDelta) -> None:
+        """
+        Rows first, a merged delta may change cells of rows appended in it
+        """
+        self.highlighted = set()
+        for row, values in delta.appended_rows:
+            position = self.append(row, values)
+            self.highlighted.update((position, column) for column in self.columns)
+        for row, column, value in delta.changed_cells:
+            position = self.positions[row]
+            self.rows[position][1][self.column_position[column]] = value
+            self.highlighted.add((position, column))
+
+
+class TableauGrid:
+    INDEX_WIDTH = 120
+    COLUMN_WIDTH = 60
+    HIGHLIGHT = "#ffe08a"
+
+    def __init__(self, master, columns, index_header: str = "", height: int = 12):
+        """
+        :param columns: attribute columns, e.g. ['A', 'B', 'C']
+        :param index_header: header of the first column holding the row index or decomposition key
+        :param height: number of visible rows
+        """
+        self.data = TableauRows(columns)
+        self.columns = self.data.columns
+        self.index_header = index_header
+        self.visible_rows = height
+        # position of the first visible row
+        self.top = 0
+        self.row_height = tkfont.nametofont("TkDefaultFont").metrics("linespace") + 6
+        width = self.INDEX_WIDTH + self.COLUMN_WIDTH * len(self.columns)
+
+        self.frame = Frame(master)
+        self.header = Canvas(self.frame, width=width, height=self.row_height, highlightthickness=0)
+        self.canvas = Canvas(self.frame, width=width, height=self.row_height * height, highlightthickness=0,
+                             background="white")
+        self.scrollbar = Scrollbar(self.frame, orient="vertical", command=self.yview)
+        self.header.grid(row=0, column=0, sticky="ew")
+        self.canvas.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+        self.frame.rowconfigure(1, weight=1)
+        self.frame.columnconfigure(0, weight=1)
+
+        self.draw_header(index_header)
+        # canvas items of the visible slots, reused when scrolling
+        self.slots = []
+        self.build_slots()
+        self.canvas.bind("<Configure>", self.on_resize)
+        self.canvas.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.canvas.bind("<Button-4>", lambda event: self.scroll(-3))
+        self.canvas.bind("<Button-5>", lambda event: self.scroll(3))
+
+    def pack(self, **kwargs) -> None:
+        self.frame.pack(**kwargs)
+
+    def column_x(self, i: int) -> int:
+        """
+        Left x of column i, column 0 is the index column
+        """
+        return 0 if i == 0 else self.INDEX_WIDTH + self.COLUMN_WIDTH * (i - 1)
+
+    def column_width(self, i: int) -> int:
+        return self.INDEX_WIDTH if i == 0 else self.COLUMN_WIDTH
+
+    def draw_header(self, index_header: str) -> None:
+        for i, text in enumerate([index_header] + self.columns):
+            x, w = self.column_x(i), self.column_width(i)
+            self.header.create_rectangle(x, 0, x + w, self.row_height, fill="#e6e6e6", outline="#b0b0b0")
+            self.header.create_text(x + w / 2, self.row_height / 2, text=text)
+
+    def build_slots(self) -> None:
+        """
+        One rectangle and one text item per cell of each visible row
+        """
+        self.canvas.delete("all")
+        self.slots = []
+        for slot in range(self.visible_rows):
+            y = slot * self.row_height
+            cells = []
+            for i in range(len(self.columns) + 1):
+                x, w = self.column_x(i), self.column_width(i)
+                rectangle = self.canvas.create_rectangle(x, y, x + w, y + self.row_height, fill="white",
+                                                         outline="#d9d9d9")
+                text = self.canvas.create_text(x + w / 2, y + self.row_height / 2, text="")
+                cells.append((rectangle, text))
+            self.slots.append(cells)
+
+    def render(self) -> None:
+        """
+        Fill the slots with the rows from top, only visible rows are read
+        """
+        total = len(self.data)
+        self.top = max(0, min(self.top, total - self.visible_rows))
+        for slot, cells in enumerate(self.slots):
+            position = self.top + slot
+            if position < total:
+                row, values = self.data[position]
+                texts = [row] + values
+            else:
+                texts = [""] * len(cells)
+            for i, (rectangle, text) in enumerate(cells):
+                highlighted = i > 0 and (position, self.columns[i - 1]) in self.data.highlighted
+                self.canvas.itemconfigure(rectangle, fill=self.HIGHLIGHT if highlighted else "white")
+                self.canvas.itemconfigure(text, text=texts[i])
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible_rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def on_resize(self, event) -> None:
+        visible_rows = max(1, event.height // self.row_height)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.build_slots()
+            self.render()
+
+    def on_mouse_wheel(self, event) -> None:
+        self.scroll(-1 if event.delta > 0 else 1)
+
+    def scroll(self, rows: int) -> None:
+        self.top += rows
+        self.render()
+
+    def yview(self, *args) -> None:
+        """
+        Scrollbar command, ('moveto', fraction) or ('scroll', n, 'units' | 'pages')
+        """
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.data))
+        elif args[0] == "scroll":
+            step = self.visible_rows if args[2] == "pages" else 1
+            self.top += int(args[1]) * step
+        self.render()
+
+    def see(self, position: int) -> None:
+        if position < self.top:
+            self.top = position
+        elif position >= self.top + self.visible_rows:
+            self.top = position - self.visible_rows + 1
+
+    def load(self, rows) -> None:
+        """
+        Fill the grid once, rows are (row, values)
+        """
+        self.data.load(rows)
+        self.top = 0
+        self.render()
+
+    def apply_delta(self, delta: TableDelta) -> None:
+        """
+        Patch the rows and highlight the cells changed in this step
+        """
+        self.data.apply_delta(delta)
+        if delta.appended_rows:
+            self.see(len(self.data) - 1)
+        elif delta.changed_cells:
+            self.see(min(self.data.positions[row] for row, column, value in delta.changed_cells))
+        self.render()
@@ -0,0 +1,118 @@
+"""
+Persistent hash index on lhs projections of a chase tableau.
+For each lhs probed by the chase, keep projection tuple -> row ids, and update it
+as cells are equated or rows are appended instead of regrouping the whole tableau.
+"""
+
+from collections import Counter
+
+import pandas as pd
+
+
+class TableauIndex:
+    def __init__(self, table: pd.DataFrame):
+        self.columns = list(table.columns)
+        self.column_position = {column: i for i, column in enumerate(self.columns)}
+        # mirror of the tableau values, row id is the position in the DataFrame
+        self.rows = [list(row) for row in table.itertuples(index=False, name=None)]
+        # full row tuple -> number of rows with these values
+        self.row_counts = Counter(tuple(row) for row in self.rows)
+        # lhs columns -> {projection tuple -> set of row ids}
+        self.indexes = {}
+        # lhs columns -> projection tuples shared by at least two rows
+        self.matching_keys = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def projection(self, row_id: int, lhs: tuple) -> tuple:
+        row = self.rows[row_id]
+        return tuple(row[self.column_position[column]] for column in lhs)
+
+    def build(self, lhs: tuple) -> None:
+        index = {}
+        for row_id in range(len(self.rows)):
+            index.setdefault(self.projection(row_id, lhs), set()).add(row_id)
+        self.indexes[lhs] = index
+        self.matching_keys[lhs] = {key for key, row_ids in index.items() if len(row_ids) > 1}
+
+    def matching_groups(self, xs) -> list[list[int]]:
+        """
+        Groups of row ids with same xs values, only groups with at least two rows,
+        sorted by their xs values like DataFrame.groupby
+        """
+        lhs = tuple(xs)
+        if lhs not in self.indexes:
+            self.build(lhs)
+        index = self.indexes[lhs]
+        return [sorted(index[key]) for key in sorted(self.matching_keys[lhs])]
+
+    def value(self, row_id: int, column: str):
+        return self.rows[row_id][self.column_position[column]]
+
+    def contains(self, values) -> bool:
+        """
+        Check if a row with exactly these values exists
+        """
+        return self.row_counts[tuple(values)] > 0
+
+    def missing_rows(self, rows) -> list:
+        """
+        Keep only rows not in the tableau yet, each distinct row once, in their original order
+        """
+        missing = []
+        seen = set()
+        for row in rows:
+            key = tuple(row)
+            if self.row_counts[key] == 0 and key not in seen:
+                seen.add(key)
+                missing.append(row)
+        return missing
+
+    def _add_to_indexes(self, row_id: int, lhs_list) -> None:
+        for lhs in lhs_list:
+            key = self.projection(row_id, lhs)
+            row_ids = self.indexes[lhs].setdefault(key, set())
+            row_ids.add(row_id)
+            if len(row_ids) > 1:
+                self.matching_keys[lhs].add(key)
+
+    def _remove_from_indexes(self, row_id: int, lhs_list) -> None:
+        for lhs in lhs_list:
+            key = self.projection(row_id, lhs)
+            row_ids = self.indexes[lhs][key]
+            row_ids.discard(row_id)
+            if len(row_ids) < 2:
+                self.matching_keys[lhs].discard(key)
+            if not row_ids:
+                del self.indexes[lhs][key]
+
+    def set_value(self, row_ids, column: str, value) -> list[int]:
+        """
+        Equate cells of column in row_ids to value, only the lhs indexes containing column are touched
+        :return: row ids whose value changed
+        """
+        position = self.column_position[column]
+        affected_lhs = [lhs for lhs in self.indexes if column in lhs]
+        changed_row_ids = []
+        for row_id in row_ids:
+            row = self.rows[row_id]
+            if row[position] == value:
+                continue
+            self._remove_from_indexes(row_id, affected_lhs)
+            self.row_counts[tuple(row)] -= 1
+            row[position] = value
+            self.row_counts[tuple(row)] += 1
+            self._add_to_indexes(row_id, affected_lhs)
+            changed_row_ids.append(row_id)
+        return changed_row_ids
+
+    def append_row(self, values) -> int:
+        """
+        :return: row id of the appended row
+        """
+        row_id = len(self.rows)
+        self.rows.append(list(values))
+        self.row_counts[tuple(values)] += 1
+        self._add_to_indexes(row_id, list(self.indexes))
+        return row_id
@@ -0,0 +1,114 @@
+"""
+Naive reference implementations the optimized algorithms are checked against, only fit for a few attributes
+"""
+
+import random
+from itertools import combinations
+
+
+def random_fds(seed: int, num_attributes: int, num_fds: int, max_lhs: int = 2) -> list[list]:
+    """
+    e.g. [[['A', 'C'], ['B']], [['B'], ['D']]]
+    """
+    rng = random.Random(seed)
+    attributes = [chr(ord('A') + i) for i in range(num_attributes)]
+    fds = []
+    for _ in range(num_fds):
+        lhs = sorted(rng.sample(attributes, rng.randint(1, max_lhs)))
+        rhs = [rng.choice([attribute for attribute in attributes if attribute not in lhs])]
+        fds.append([lhs, rhs])
+    return fds
+
+
+def naive_closure(attributes, fds) -> set:
+    """
+    Apply every fd until nothing is added
+    """
+    closure = set(attributes)
+    changed = True
+    while changed:
+        changed = False
+        for lhs, rhs in fds:
+            if set(lhs) <= closure and not set(rhs) <= closure:
+                closure |= set(rhs)
+                changed = True
+    return closure
+
+
+def naive_candidate_keys(attributes, fds) -> set:
+    """
+    Superkeys with no superkey among their proper subsets, from every attribute subset
+    """
+    superkeys = [set(lhs) for size in range(len(attributes) + 1) for lhs in combinations(attributes, size)
+                 if naive_closure(lhs, fds) >= set(attributes)]
+    return {tuple(sorted(key)) for key in superkeys if not any(other < key for other in superkeys)}
+
+
+def is_equivalent(fds1, fds2) -> bool:
+    """
+    Each fd set implies every fd of the other
+    """
+    return all(set(rhs) <= naive_closure(lhs, fds2) for lhs, rhs in fds1) and \
+        all(set(rhs) <= naive_closure(lhs, fds1) for lhs, rhs in fds2)
+
+
+def naive_min_covers(fds) -> set:
+    """
+    Signatures of the subsets of fds that are equivalent to fds and have no fd implied by the others
+    """
+    covers = set()
+    for size in range(len(fds) + 1):
+        for cover in combinations(fds, size):
+            cover = list(cover)
+            if not is_equivalent(cover, fds):
+                continue
+            if any(set(rhs) <= naive_closure(lhs, cover[:i] + cover[i + 1:]) for i, (lhs, rhs) in enumerate(cover)):
+                continue
+            covers.add(frozenset((tuple(lhs), tuple(rhs)) for lhs, rhs in cover))
+    return covers
+
+
+def naive_implied_fds(attributes, fds) -> set:
+    """
+    (lhs, rhs attribute) of every non-trivial implied fd whose lhs has no proper subset determining the rhs
+    """
+    implied = set()
+    for size in range(len(attributes) + 1):
+        for lhs in combinations(sorted(attributes), size):
+            for attribute in naive_closure(lhs, fds) - set(lhs):
+                if not any(attribute in naive_closure(lhs[:i] + lhs[i + 1:], fds) for i in range(len(lhs))):
+                    implied.add((lhs, attribute))
+    return implied
+
+
+def naive_sub_covers(candidate_fds, num_attributes: int) -> list:
+    """
+    Subsets of candidate_fds mentioning every attribute and implying all candidates, without a smaller such subset,
+    in the order of subsets counted with the first candidate as the highest bit
+    """
+    covers = []
+    n = len(candidate_fds)
+    for mask in range(1 << n):
+        subset = [fd for i, fd in enumerate(candidate_fds) if mask >> (n - 1 - i) & 1]
+        if len({attribute for lhs, rhs in subset for attribute in lhs + rhs}) != num_attributes:
+            continue
+        if not all(set(rhs) <= naive_closure(lhs, subset) for lhs, rhs in candidate_fds):
+            continue
+        if not any(all(fd in subset for fd in cover) for cover in covers):
+            covers.append(subset)
+    return covers
+
+
+def random_dependencies(seed: int, num_attributes: int, num_dependencies: int, max_lhs: int = 2) -> list[str]:
+    """
+    Mix of fds and mvds, e.g. ['A,C->B', 'B->>D,E']
+    """
+    rng = random.Random(seed)
+    attributes = [chr(ord('A') + i) for i in range(num_attributes)]
+    dependencies = []
+    for _ in range(num_dependencies):
+        lhs = sorted(rng.sample(attributes, rng.randint(1, max_lhs)))
+        rest = [attribute for attribute in attributes if attribute not in lhs]
+        rhs = sorted(rng.sample(rest, rng.randint(1, len(rest) - 1)))
+        dependencies.append(f"{','.join(lhs)}{rng.choice(['->', '->>'])}{','.join(rhs)}")
+    return dependencies
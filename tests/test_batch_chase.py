@@ -0,0 +1,21 @@
+import os
+
+from batch_chase import add_checkpoints, get_checkpoint_name
+
+
+def test_checkpoint_stays_in_directory(tmp_path):
+    checkpoint_dir = str(tmp_path / "checkpoints")
+    problems = [{"id": "../../etc/x", "type": "dependency"}, {"id": "/abs", "type": "lossless"},
+                {"id": 7, "type": "dependency"}, {"type": "dependency"}, {"id": "a/b"}, {"id": "a_b"}]
+    paths = [problem["checkpoint"] for problem in add_checkpoints(problems, checkpoint_dir)]
+    for path in paths:
+        assert os.path.dirname(path) == checkpoint_dir
+    assert os.path.basename(paths[2]) == "7.ckpt"
+    assert os.path.basename(paths[3]) == "line4.ckpt"
+    assert len(set(paths)) == len(paths)
+
+
+def test_checkpoint_name_keeps_safe_ids():
+    assert get_checkpoint_name("problem-1_a") == "problem-1_a"
+    assert get_checkpoint_name("..").startswith("__-")
+    assert get_checkpoint_name("") != ""
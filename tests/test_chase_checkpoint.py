@@ -0,0 +1,95 @@
+import os
+import pickle
+
+import pandas as pd
+import pytest
+
+from chase_checkpoint import ChaseCheckpointer
+from chase_with_distinguished_variables import DistinguishedVariableChaseChecker
+from simple_chase import SimpleChaseChecker
+
+
+class Interrupted(Exception):
+    pass
+
+
+class InterruptingCheckpointer(ChaseCheckpointer):
+    """
+    Stops the chase right after its stop_after-th checkpoint, as if the process was pre-empted
+    """
+    def __init__(self, path: str, stop_after: int):
+        super().__init__(path, every_steps=1)
+        self.stop_after = stop_after
+
+    def save(self, problem: dict, table, worklist: list[str], steps: int) -> None:
+        super().save(problem, table, worklist, steps)
+        if self.saved == self.stop_after:
+            raise Interrupted()
+
+
+PROBLEMS = [
+    (list("ABCDE"), ["A->>B", "B->>C", "C->D", "D->>E"], "A->>C,E"),
+    (list("ABCDE"), ["A->B", "B->>C", "C,D->E", "E->A"], "A->E"),
+    (list("ABCD"), ["A->>B,C", "C,D->B"], "A->B"),
+]
+
+
+def make_checker(kind: str, problem, checkpoint=None):
+    attributes, dependencies, desired = problem
+    if kind == "simple":
+        return SimpleChaseChecker(False, attributes, dependencies, desired, verbose=False, checkpoint=checkpoint)
+    engine, restricted = kind.split("-")
+    return DistinguishedVariableChaseChecker(engine, restricted == "restricted", 0, attributes, dependencies, desired,
+                                             verbose=False, checkpoint=checkpoint)
+
+
+def run(checker):
+    return checker.run_simple_chase_algorithm() if isinstance(checker, SimpleChaseChecker) else \
+        checker.run_chase_algorithm()
+
+
+def to_frame(table) -> pd.DataFrame:
+    table = table if isinstance(table, pd.DataFrame) else table.to_dataframe()
+    return table.reset_index(drop=True)
+
+
+@pytest.mark.parametrize("kind", ["simple", "pandas-unrestricted", "pandas-restricted", "numpy-unrestricted",
+                                  "numpy-restricted"])
+@pytest.mark.parametrize("problem", PROBLEMS)
+@pytest.mark.parametrize("stop_after", [1, 2, 3])
+def test_resume_matches_uninterrupted_run(tmp_path, kind, problem, stop_after):
+    expected = run(make_checker(kind, problem))
+    path = str(tmp_path / "chase.ckpt")
+    # a short chase may finish before its stop_after-th checkpoint, then there is nothing to resume
+    try:
+        run(make_checker(kind, problem, InterruptingCheckpointer(path, stop_after)))
+    except Interrupted:
+        assert os.path.exists(path)
+    result = run(make_checker(kind, problem, ChaseCheckpointer(path, every_steps=1)))
+    assert result.success == expected.success
+    assert result.steps == expected.steps
+    pd.testing.assert_frame_equal(to_frame(result.table), to_frame(expected.table))
+    assert not os.path.exists(path)
+
+
+def test_checkpoint_of_another_problem(tmp_path):
+    path = str(tmp_path / "chase.ckpt")
+    with pytest.raises(Interrupted):
+        run(make_checker("pandas-unrestricted", PROBLEMS[0], InterruptingCheckpointer(path, 1)))
+    with pytest.raises(ValueError, match="another problem"):
+        run(make_checker("pandas-restricted", PROBLEMS[0], ChaseCheckpointer(path, every_steps=1)))
+    with pytest.raises(ValueError, match="another problem"):
+        run(make_checker("pandas-unrestricted", PROBLEMS[1], ChaseCheckpointer(path, every_steps=1)))
+
+
+def test_checkpoint_of_another_version(tmp_path):
+    path = str(tmp_path / "chase.ckpt")
+    with pytest.raises(Interrupted):
+        run(make_checker("simple", PROBLEMS[0], InterruptingCheckpointer(path, 1)))
+    with open(path, "rb") as f:
+        state = pickle.load(f)
+    state["version"] = 0
+    with open(path, "wb") as f:
+        pickle.dump(state, f)
+    with pytest.raises(ValueError, match="version"):
+        run(make_checker("simple", PROBLEMS[0], ChaseCheckpointer(path, every_steps=1)))
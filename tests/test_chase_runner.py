@@ -0,0 +1,67 @@
+import itertools
+import os
+import sys
+import time
+
+from chase_runner import CANCELLED, DONE, FINISHED, ChaseRunner
+from chase_trace import TraceReader, TraceWriter
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "GUI"))
+from chase_generator_distinguished_version import DistinguishedVariableChaseChecker  # noqa: E402
+
+
+class FakeRoot:
+    def after(self, ms, callback):
+        pass
+
+
+def count_steps():
+    for i in itertools.count():
+        yield f"step {i}"
+
+
+def wait_for(predicate, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < end
+        time.sleep(0.005)
+
+
+def test_pause_during_play():
+    runner = ChaseRunner(count_steps(), FakeRoot(), on_frame=None, on_finish=None)
+    runner.start()
+    runner.play(200)
+    wait_for(lambda: runner.events.qsize() >= 3)
+    runner.pause()
+    # a step already past the wait may still finish
+    time.sleep(0.05)
+    paused = runner.events.qsize()
+    time.sleep(0.2)
+    assert runner.events.qsize() == paused
+
+    runner.step()
+    wait_for(lambda: runner.events.qsize() == paused + 1)
+    time.sleep(0.1)
+    assert runner.events.qsize() == paused + 1
+
+    runner.cancel()
+    runner.worker.join(5)
+    assert not runner.worker.is_alive()
+    values = [runner.events.get_nowait() for _ in range(runner.events.qsize())]
+    assert values[-1] == (FINISHED, CANCELLED, None)
+
+
+def test_run_to_end_of_failing_chase(tmp_path):
+    checker = DistinguishedVariableChaseChecker(0, list("ABC"), "A->B;B->C", "C->A")
+    path = str(tmp_path / "run.trace")
+    trace = TraceWriter(path, checker.attributes, checker.get_rows())
+    runner = ChaseRunner(checker.chase_generator(), FakeRoot(), on_frame=None, on_finish=None, trace=trace)
+    runner.start()
+    runner.run_to_end()
+    runner.worker.join(5)
+    assert not runner.worker.is_alive()
+    values = [runner.events.get_nowait() for _ in range(runner.events.qsize())]
+    assert values[-1] == (FINISHED, DONE, None)
+    assert "Invalid desired dependency" in values[-2]
+    with TraceReader(path) as reader:
+        assert len(reader) == len(values) - 1
@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+
+from chase_trace import TraceReader, TraceWriter, read_varint, write_varint
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "GUI"))
+from chase_generator_distinguished_version import DistinguishedVariableChaseChecker  # noqa: E402
+
+
+def test_varint_round_trip():
+    numbers = [0, 1, 127, 128, 255, 300, 16383, 16384, 2 ** 32 - 1, 2 ** 63 + 5]
+    buffer = bytearray()
+    for n in numbers:
+        write_varint(buffer, n)
+    offset = 0
+    for n in numbers:
+        value, offset = read_varint(buffer, offset)
+        assert value == n
+    assert offset == len(buffer)
+
+
+def get_values(checker) -> list[list[str]]:
+    return [[str(value) for value in values] for row, values in checker.get_rows()]
+
+
+@pytest.mark.parametrize("attributes, dependencies, desired", [
+    ("ABCD", "A->>B,C;D->C", "A->C"),
+    ("ABCDE", "A->>B;B->>C;C->D;D->>E", "A->>C,E"),
+    ("ABC", "A->B;B->C", "C->A"),
+])
+@pytest.mark.parametrize("snapshot_every", [1, 2, 64])
+def test_seek_matches_recorded_tableau(tmp_path, attributes, dependencies, desired, snapshot_every):
+    checker = DistinguishedVariableChaseChecker(0, list(attributes), dependencies, desired)
+    path = str(tmp_path / "run.trace")
+    tableaux = [get_values(checker)]
+    messages = []
+    with TraceWriter(path, checker.attributes, checker.get_rows(), "", snapshot_every) as writer:
+        for value in checker.chase_generator():
+            writer.add(value)
+            tableaux.append(get_values(checker))
+            messages.append(value[0] if type(value) == tuple else value)
+
+    with TraceReader(path) as reader:
+        assert len(reader) == len(messages)
+        if snapshot_every == 1:
+            assert len(reader.snapshot_steps) > 1
+        # seek backwards too, so a step is never read right after the step before it
+        for step in list(range(len(reader) + 1)) + list(range(len(reader), -1, -1)):
+            assert reader.values(step) == tableaux[step]
+        for step in range(1, len(reader) + 1):
+            assert reader.message(step) == messages[step - 1]
+            if not reader.changes_table(step):
+                assert tableaux[step] == tableaux[step - 1]
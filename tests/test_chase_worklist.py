@@ -0,0 +1,27 @@
+import pytest
+
+from chase_with_distinguished_variables import DistinguishedVariableChaseChecker
+from chase_worklist import ChaseWorklist
+
+
+@pytest.mark.parametrize("engine", ["pandas", "numpy"])
+@pytest.mark.parametrize("restricted", [False, True])
+def test_rhs_change_requeues_fd(engine, restricted):
+    # C->E changes column E of one group only, C,E->A must be tried again although its lhs C is unchanged
+    checker = DistinguishedVariableChaseChecker(engine=engine, restricted=restricted, option=1,
+                                                attributes=list("ABCDEF"),
+                                                dependencies=["C,E->A", "A,E->C", "C->E", "D->A"],
+                                                desired=[list("CDE"), list("ABCF"), list("BDEF"), list("AE"),
+                                                         list("CDF")], verbose=False)
+    assert checker.run_chase_algorithm().success
+
+
+def test_notify_changed():
+    worklist = ChaseWorklist(["A->B", "C->D", "E->>F"])
+    while worklist:
+        worklist.pop()
+    # rhs column of A->B, and any change for the mvd
+    worklist.notify_changed(["B"])
+    assert worklist.get_pending() == ["A->B", "E->>F"]
+    worklist.notify_changed([])
+    assert worklist.get_pending() == ["A->B", "E->>F"]
@@ -0,0 +1,38 @@
+from itertools import combinations
+
+import pytest
+
+from brute_force import naive_closure, random_fds
+from fd_closure import ClosureCache, FDIndex, closure_cache
+from generate_minimal_cover_jacob import cal_attribute_closure
+
+
+def test_closure_index_shared_across_queries():
+    closure_cache.clear()
+    fds = [[['A'], ['B']], [['B'], ['C']]]
+    assert cal_attribute_closure({'A'}, fds) == {'A', 'B', 'C'}
+    assert cal_attribute_closure({'B', 'D'}, fds) == {'B', 'C', 'D'}
+    assert cal_attribute_closure({'E'}, fds) == {'E'}
+    assert len(closure_cache.indexes) == 1
+
+
+def test_closure_keeps_unknown_attributes():
+    cache = ClosureCache()
+    fd_index = cache.get_index([[['A'], ['B']]])
+    assert cache.closure(fd_index, {'A', 'Z'}) == {'A', 'B', 'Z'}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_closure_matches_naive_closure(seed):
+    fds = random_fds(seed, 6, 6, max_lhs=3)
+    fd_index = FDIndex(fds)
+    attributes = sorted(fd_index.attribute_bits)
+    for size in range(len(attributes) + 1):
+        for lhs in combinations(attributes, size):
+            assert fd_index.closure(lhs) == naive_closure(lhs, fds)
+
+
+def test_unconditional_fd():
+    fd_index = FDIndex([[[], ['A']], [['A'], ['B']]])
+    assert fd_index.closure(set()) == {'A', 'B'}
+    assert fd_index.implies(['C'], ['B'])
@@ -0,0 +1,68 @@
+from itertools import islice
+
+import pytest
+
+from brute_force import is_equivalent, naive_candidate_keys, naive_closure, naive_implied_fds, naive_min_covers, \
+    random_fds
+from generate_minimal_cover_jacob import all_min_covers, cal_combination_attribute_closure, find_candidate_keys, \
+    generate_all_min_covers, get_all_attributes, get_cover_signature, iter_implied_fds, iter_min_covers, min_cover, \
+    reduce_lhs
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_candidate_keys_match_combinations(seed):
+    fds = random_fds(seed, 6, 5, max_lhs=2)
+    all_attributes = get_all_attributes(fds)
+    keys = find_candidate_keys(all_attributes, fds)
+    # every size is searched, a combination containing a found superkey is skipped, so only keys are left
+    superkeys, _ = cal_combination_attribute_closure(all_attributes, fds, continue_longer_length=True)
+    assert set(keys) == {tuple(sorted(key)) for key in superkeys} == naive_candidate_keys(all_attributes, fds)
+    # shortest first
+    assert [len(key) for key in keys] == sorted(len(key) for key in keys)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_greedy_lhs_reduction(seed):
+    fds = random_fds(seed, 6, 6, max_lhs=3)
+    all_attributes = get_all_attributes(fds)
+    greedy = reduce_lhs(all_attributes, fds, "greedy")
+    assert is_equivalent(greedy, fds)
+    assert is_equivalent(reduce_lhs(all_attributes, fds, "lattice"), fds)
+    # no lhs attribute can be dropped
+    for lhs, rhs in greedy:
+        for attribute in lhs:
+            assert not set(rhs) <= naive_closure([a for a in lhs if a != attribute], fds)
+    assert is_equivalent(min_cover(all_attributes, fds, verbose=False, lhs_reduction="greedy"), fds)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_iter_min_covers_matches_subsets(seed):
+    fds = random_fds(seed, 4, 7, max_lhs=2)
+    covers = list(iter_min_covers(fds))
+    signatures = [get_cover_signature(cover) for cover in covers]
+    # each cover once
+    assert len(set(signatures)) == len(signatures)
+    assert set(signatures) == naive_min_covers(fds)
+    assert generate_all_min_covers(fds) == covers
+    # covers are streamed, the first ones come without finishing the search
+    assert list(islice(iter_min_covers(fds), 2)) == covers[:2]
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_implied_fds_match_subsets(seed):
+    fds = random_fds(seed, 5, 5, max_lhs=2)
+    implied = list(iter_implied_fds(fds))
+    assert len(implied) == len({(tuple(lhs), tuple(rhs)) for lhs, rhs in implied})
+    assert {(tuple(lhs), rhs[0]) for lhs, rhs in implied} == naive_implied_fds(get_all_attributes(fds), fds)
+    # smallest lhs first
+    assert [len(lhs) for lhs, _ in implied] == sorted(len(lhs) for lhs, _ in implied)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_all_min_covers_are_covers(seed):
+    fds = random_fds(seed, 4, 4, max_lhs=2)
+    covers = all_min_covers(fds)
+    assert covers
+    assert {get_cover_signature(cover) for cover in covers} == naive_min_covers(list(iter_implied_fds(fds)))
+    for cover in covers:
+        assert is_equivalent(cover, fds)
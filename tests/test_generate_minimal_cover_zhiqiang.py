@@ -0,0 +1,19 @@
+import pytest
+
+from brute_force import naive_sub_covers, random_fds
+from generate_minimal_cover_zhiqiang import gen_candidate_fds, gen_min_covers, iter_gen_min_covers
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_gen_min_covers_matches_subsets(seed):
+    fds = random_fds(seed, 4, 6, max_lhs=2)
+    candidate_fds, max_attrs = gen_candidate_fds(fds)
+    covers = gen_min_covers(fds)
+    assert covers == naive_sub_covers(candidate_fds, max_attrs)
+    assert sorted(map(str, iter_gen_min_covers(fds))) == sorted(map(str, covers))
+
+
+def test_example():
+    fds = [[['A'], ['B']], [['B'], ['C']], [['B'], ['A']], [['A'], ['C']]]
+    assert gen_min_covers(fds) == [[[['A'], ['B']], [['B'], ['A']], [['A'], ['C']]],
+                                   [[['A'], ['B']], [['B'], ['C']], [['B'], ['A']]]]
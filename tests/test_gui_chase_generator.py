@@ -0,0 +1,31 @@
+import os
+import sys
+
+import pytest
+
+from chase_trace import TraceReader
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "GUI"))
+from chase_generator_distinguished_version import DistinguishedVariableChaseChecker  # noqa: E402
+
+
+@pytest.mark.parametrize("attributes, dependencies, desired, verdict", [
+    ("ABC", "A->B;B->C", "C->A", "Sorry! Invalid desired dependency C->A."),
+    ("ABCD", "A->>B,C;D->C", "A->C", "Congrats! Valid desired dependency A->C!"),
+])
+def test_record_trace_ends(tmp_path, attributes, dependencies, desired, verdict):
+    # a failing chase used to put back every dependency that did not apply and never end
+    checker = DistinguishedVariableChaseChecker(0, list(attributes), dependencies, desired)
+    path = str(tmp_path / "run.trace")
+    steps = checker.record_trace(path)
+    with TraceReader(path) as trace:
+        assert len(trace) == steps
+        assert trace.message(steps).strip() == verdict
+
+
+def test_failing_lossless_chase_ends(tmp_path):
+    checker = DistinguishedVariableChaseChecker(1, list("ABC"), "A->C", "R1(A,B);R2(B,C)")
+    path = str(tmp_path / "run.trace")
+    steps = checker.record_trace(path)
+    with TraceReader(path) as trace:
+        assert "is not lossless" in trace.message(steps)
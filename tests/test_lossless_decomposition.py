@@ -0,0 +1,32 @@
+import pytest
+
+from chase_checking_lossless_decomposition import LosslessDecompositionChecker, SymbolUnionFind
+
+
+def test_distinguished_symbol_wins():
+    symbols = SymbolUnionFind()
+    for symbol, distinguished in [('a', True), ('a1', False), ('a2', False), ('a3', False)]:
+        symbols.add(symbol, distinguished)
+    assert symbols.union('a2', 'a3')
+    assert symbols.value('a3') == 'a2'
+    assert not symbols.is_distinguished('a3')
+    assert symbols.union('a1', 'a')
+    assert symbols.union('a3', 'a1')
+    # every symbol of the class reads the distinguished one
+    assert {symbols.value(symbol) for symbol in ['a', 'a1', 'a2', 'a3']} == {'a'}
+    assert all(symbols.is_distinguished(symbol) for symbol in ['a', 'a1', 'a2', 'a3'])
+    assert not symbols.union('a2', 'a')
+
+
+@pytest.mark.parametrize("attributes, fds, decompositions, lossless", [
+    ("ABC", [['C', 'B']], {'R1(A,C)': ['A', 'C'], 'R2(B,C)': ['B', 'C']}, True),
+    ("ABCDEF", [['B', 'E'], ['EF', 'C'], ['BC', 'A'], ['AD', 'E']],
+     {'R1(A,B,C,F)': list("ABCF"), 'R2(A,D,E)': list("ADE"), 'R3(B,D,F)': list("BDF")}, True),
+    ("ABC", [['A', 'C']], {'R1(A,B)': ['A', 'B'], 'R2(B,C)': ['B', 'C']}, False),
+])
+def test_examples(attributes, fds, decompositions, lossless):
+    checker = LosslessDecompositionChecker(list(attributes), fds, decompositions, verbose=False)
+    result = checker.run_chase_algorithm()
+    assert result.success == lossless
+    # cells read the value of their symbol class, a lossless tableau has a row without subscripts
+    assert any(all(len(value) == 1 for value in row.values()) for row in result.table.values()) == lossless
@@ -0,0 +1,15 @@
+import pandas as pd
+
+from minimal_cover_yijia import apply_dependency
+from tableau_index import TableauIndex
+
+
+def test_mvd_rows_appended_in_sync_with_index():
+    table = pd.DataFrame([['a', 'b1', 'c1'], ['a', 'b2', 'c2'], ['a', 'b3', 'c3']], columns=list("ABC"))
+    table_index = TableauIndex(table)
+    result, table = apply_dependency('A->>B', table, table_index)
+    assert result
+    # each of the three pairs gives two swapped rows
+    assert len(table) == 9
+    assert table.values.tolist() == table_index.rows
+    assert list(table.index) == list(range(9))
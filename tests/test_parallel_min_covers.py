@@ -0,0 +1,38 @@
+import pytest
+
+from brute_force import random_fds
+from generate_minimal_cover_jacob import generate_all_min_covers, iter_min_covers, iter_min_covers_from, \
+    split_min_cover_search
+from generate_minimal_cover_zhiqiang import gen_candidate_fds, gen_min_covers, iter_min_sub_covers, \
+    iter_min_sub_covers_from, split_sub_cover_search
+from parallel_min_covers import merge_covers, parallel_gen_min_covers, parallel_generate_all_min_covers
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("depth", [0, 1, 3, 10])
+def test_min_cover_branches_match_search(seed, depth):
+    fds = random_fds(seed, 4, 7, max_lhs=2)
+    branches = split_min_cover_search(fds, depth)
+    branch_covers = [list(iter_min_covers_from(fds, min(depth, len(fds)), removed, kept_redundant))
+                     for removed, kept_redundant in branches]
+    assert merge_covers(branch_covers) == list(iter_min_covers(fds))
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("depth", [0, 1, 3, 10])
+def test_sub_cover_branches_match_search(seed, depth):
+    candidate_fds, max_attrs = gen_candidate_fds(random_fds(seed, 4, 6, max_lhs=2))
+    depth = min(depth, len(candidate_fds))
+    branches = split_sub_cover_search(candidate_fds, max_attrs, depth)
+    branch_covers = [list(iter_min_sub_covers_from(candidate_fds, max_attrs, depth, mask, kept_mask, kept_droppable))
+                     for mask, kept_mask, kept_droppable in branches]
+    assert sorted(map(str, merge_covers(branch_covers))) == sorted(map(str, iter_min_sub_covers(candidate_fds,
+                                                                                                  max_attrs)))
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_parallel_matches_sequential(seed):
+    fds = random_fds(seed, 4, 7, max_lhs=2)
+    for depth in [None, 2]:
+        assert parallel_generate_all_min_covers(fds, workers=2, depth=depth) == generate_all_min_covers(fds)
+        assert parallel_gen_min_covers(fds, workers=2, depth=depth) == gen_min_covers(fds)
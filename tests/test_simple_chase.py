@@ -0,0 +1,14 @@
+import pytest
+
+from dependency_basis import DependencyBasisChecker
+from simple_chase import SimpleChaseChecker
+
+
+@pytest.mark.parametrize("restricted", [False, True])
+def test_mvd_swaps_every_pair_of_a_group(restricted):
+    # D->>A groups three rows, the pair of the first two rows is already in the tableau
+    attributes, dependencies = list("ABCDE"), ["D->>E,A", "E->>C", "D->>A"]
+    checker = SimpleChaseChecker(restricted=restricted, attributes=attributes, dependencies=dependencies,
+                                 desired_dependency="D->>A,C", verbose=False)
+    assert checker.run_simple_chase_algorithm().success
+    assert DependencyBasisChecker(attributes, dependencies).implies("D->>A,C")